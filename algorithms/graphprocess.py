@@ -1,13 +1,109 @@
 """Graph processing algorithms."""
 
-from structures.graph import Path, DirGraph
+import heapq
+import inspect
+from array import array
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import wraps
+from itertools import chain, count
+
+from structures.graph import (Vertex, Path, DirGraph, Graph, CSRGraph,
+                              WeightedDirGraph, WeightedGraph)
+from structures.unionfind import UnionFind
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def _cached(method):
+    """Look up results of method in graph cache, if enabled.
+
+    Results are keyed on the method name and arguments, with defaults
+    filled in so the same query always has the same key. The cache is
+    cleared whenever the graph version has changed since the last lookup.
+    Paths are copied going into and out of the cache, so callers can
+    modify the paths they get back.
+    """
+    signature = inspect.signature(method)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = getattr(self, '_cache', None)
+        if cache is None:
+            return method(self, *args, **kwargs)
+        if self._cache_version != self.version:
+            cache.clear()
+            self._cache_version = self.version
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__, bound.args[1:],
+               tuple(sorted(bound.kwargs.items())))
+        if key in cache:
+            self._cache_hits += 1
+            cache.move_to_end(key)
+            return _copy_paths(cache[key])
+        self._cache_misses += 1
+        result = method(self, *args, **kwargs)
+        cache[key] = _copy_paths(result)
+        if len(cache) > self._cache_maxsize:
+            cache.popitem(last=False)
+        return result
+    return wrapper
+
+
+def _copy_paths(result):
+    """Copy paths in result, which may be a path or tuple holding one."""
+    if isinstance(result, Path):
+        return Path(list(result.vertices))
+    if isinstance(result, tuple):
+        return tuple(_copy_paths(item) for item in result)
+    return result
 
 
 class DirGraphProcess(DirGraph):
     """Graph processing algorithms for directed graph class."""
 
-    def dfs_rec_shortpath(self, start, end, path=Path([]), shortpath=None):
-        """Recursive depth-first shortest path between two vertices.
+    def enable_cache(self, maxsize=128):
+        """Cache shortest path results.
+
+        Results are kept for the most recently used maxsize queries and are
+        discarded when the graph changes. Each call returns its own copy of
+        a cached path.
+
+        Parameters
+        ----------
+        maxsize: int, default 128
+            Maximum number of results to keep.
+        """
+        self._cache = OrderedDict()
+        self._cache_maxsize = maxsize
+        self._cache_version = self.version
+        self._cache_hits = self._cache_misses = 0
+
+    def disable_cache(self):
+        """Stop caching shortest path results and discard the cache."""
+        self._cache = None
+
+    def cache_info(self):
+        """Get shortest path cache statistics.
+
+        Returns
+        -------
+        info: CacheInfo
+            Named tuple of hits, misses, maxsize and current size, None if
+            caching is not enabled.
+        """
+        if getattr(self, '_cache', None) is None:
+            return None
+        return CacheInfo(self._cache_hits, self._cache_misses,
+                         self._cache_maxsize, len(self._cache))
+
+    def dfs_rec_shortpath(self, start, end, max_depth=None):
+        """Depth-first shortest path between two vertices.
+
+        Kept for compatibility with earlier versions, which searched every
+        simple path recursively. The search is now the iterative deepening
+        search of dfs_it_shortpath and never recurses.
 
         Parameters
         ----------
@@ -15,146 +111,631 @@ class DirGraphProcess(DirGraph):
             Vertex to start search at
         end: Vertex
             Vertex to end at
-        path: Path, default empty
-            Current path
-        shortpath: Path, default None
-            short path so far
+        max_depth: int, default None
+            Longest path length, in edges, to search. By default no limit.
+
+        Returns
+        -------
+        shortpath: Path
+            Shortest path from start to end, None if there is no path.
+        """
+        return self.dfs_it_shortpath(start, end, max_depth)
+
+    @_cached
+    def dfs_it_shortpath(self, start, end, max_depth=None):
+        """Iterative deepening depth-first shortest path between two vertices.
 
+        Runs depth-limited searches with an explicit stack for limits 0, 1,
+        2, ... so the first path found is a shortest one. Within a search a
+        vertex is only expanded again if it is reached at a smaller depth
+        than before. Since depths only decrease, a vertex is expanded at
+        most limit times in a search, so a search with limit at most d costs
+        O(d (V + E)) and finding a path of d edges takes O(d^2 (V + E)) time
+        in the worst case, against O(V + E) for bfs_it_shortpath, but
+        memory is only proportional to d. A single depth-first pass first
+        checks that end can be reached at all, so an unreachable end costs
+        O(V + E) rather than one search per level of the graph.
+
+        Parameters
+        ----------
+        start: Vertex
+            Vertex to start search at
+        end: Vertex
+            Vertex to end at
+        max_depth: int, default None
+            Longest path length, in edges, to search. By default no limit.
 
         Returns
         -------
         shortpath: Path
-            Shortest path from start to end.
+            Shortest path from start to end, None if there is no path.
         """
         # check start and end are in graph
-        if start not in self.vertices:
+        if start not in self:
             raise ValueError('Start vertex not in graph')
-        if end not in self.vertices:
+        if end not in self:
             raise ValueError('End vertex not in graph')
-        # add starting vertex to path
-        path = path + Path([start])
-        # if we've reached the end return path
         if start == end:
-            return path
-        # for each child of start vertex
-        for vertex in self.children(start):
-            # if vertex hasn't been visted
-            if vertex not in path:
-                # if path is shorter than shortpath
-                if shortpath is None or len(path) < len(shortpath):
-                    # get short path from new vertex to end
-                    newpath = self.dfs_rec_shortpath(vertex, end, path,
-                                                     shortpath)
-                    # if short path is found its <= length of shortpath
-                    if newpath is not None:
-                        shortpath = newpath
-        return shortpath
+            return Path([start])
+        if end not in self.dfs_preorder(start):
+            return None
+        limit = 1
+        while max_depth is None or limit <= max_depth:
+            vertices, cutoff = self._depth_limited_search(start, end, limit)
+            if vertices is not None:
+                return Path(vertices)
+            if not cutoff:
+                break
+            limit += 1
+        return None
 
-    def dfs_it_shortpath(self, start, end):
-        """Iterative depth-first shortest path between two vertices.
+    def _depth_limited_search(self, start, end, limit):
+        """Depth-first search for path of at most limit edges.
 
         Parameters
         ----------
         start: Vertex
             Vertex to start search at
         end: Vertex
-            Vertex to end at
+            Vertex to end at, different from start
+        limit: int
+            Longest path length, in edges, to search.
 
         Returns
         -------
-        shortpath: Path
-            Shortest path from start to end.
-        """
-        pathqueue = [Path([start])]
-        shortpath = None
-        while pathqueue:
-            tmppath = pathqueue.pop()
-            lastvertex = tmppath.vertices[-1]
-            if lastvertex == end and shortpath is None:
-                shortpath = tmppath
-            elif lastvertex == end and len(tmppath) < len(shortpath):
-                shortpath = tmppath
-            for nextvertex in self.children(lastvertex):
-                if nextvertex not in tmppath:
-                    newpath = tmppath + Path([nextvertex])
-                    pathqueue.append(newpath)
-        return shortpath
+        vertices, cutoff: list, bool
+            List of vertices of path found or None, and whether any vertex
+            was left unexpanded because of the limit.
+        """
+        # smallest depth each vertex has been expanded at
+        depths = {start: 0}
+        path = [start]
+        stack = [iter(self.children(start))]
+        cutoff = False
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                path.pop()
+                continue
+            depth = len(path)
+            if child == end:
+                return path + [child], cutoff
+            if depth >= limit:
+                cutoff = True
+            elif depths.get(child, limit) > depth:
+                depths[child] = depth
+                path.append(child)
+                stack.append(iter(self.children(child)))
+        return None, cutoff
 
+    @_cached
     def bfs_it_shortpath(self, start, end):
         """Iterative breadth-first shortest path between two vertices.
 
+        Each vertex is visited at most once and only its parent in the
+        search tree is stored, so the search is O(V + E) and the path is
+        built once at the end.
+
+        Parameters
+        ----------
+        start: Vertex
+            Vertex to start search at
+        end: Vertex
+            Vertex to end at
+
+        Returns
+        -------
+        shortpath: Path
+            Shortest path from start to end, None if there is no path.
+        """
+        return self.bfs_shortpaths(start, [end])[end]
+
+    def bfs_shortpaths(self, start, ends=None):
+        """Breadth-first shortest paths from start to many vertices.
+
+        A single search is run, stopping once all of ends have been reached.
+
+        Parameters
+        ----------
+        start: Vertex
+            Vertex to start search at
+        ends: iterable of Vertexs, default None
+            Vertices to find paths to. By default all vertices reachable
+            from start.
+
+        Returns
+        -------
+        shortpaths: dict
+            Keys are the vertices of ends and values are shortest paths from
+            start, None for vertices that can't be reached.
+        """
+        if start not in self:
+            raise ValueError('Start vertex not in graph')
+        if ends is not None:
+            ends = set(ends)
+            for end in ends:
+                if end not in self:
+                    raise ValueError('End vertex not in graph')
+        parents = self._bfs_parents(start, ends)
+        if ends is None:
+            ends = parents
+        return {end: _trace(parents, end) for end in ends}
+
+    @_cached
+    def bfs_bidir_shortpath(self, start, end):
+        """Bidirectional breadth-first shortest path between two vertices.
+
+        Searches forward along children from start and backward along
+        parents from end, one level at a time on whichever side has the
+        smaller frontier, and stops as soon as the two searches meet. On
+        large sparse graphs this visits far fewer vertices than a one-sided
+        search.
+
         Parameters
         ----------
         start: Vertex
             Vertex to start search at
         end: Vertex
             Vertex to end at
-        path: Path, default empty
-            Current path
 
         Returns
         -------
         shortpath: Path
-            Shortest path from start to end.
-        """
-        pathqueue = [Path([start])]
-        while pathqueue:
-            # Get and remove oldest element in pathQueue
-
-            tmppath = pathqueue.pop(0)
-            lastvertex = tmppath.vertices[-1]
-            if lastvertex == end:
-                return tmppath
-            for nextvertex in self.children(lastvertex):
-                if nextvertex not in tmppath:
-                    newpath = tmppath + Path([nextvertex])
-                    pathqueue.append(newpath)
+            Shortest path from start to end, None if there is no path.
+        """
+        if start not in self:
+            raise ValueError('Start vertex not in graph')
+        if end not in self:
+            raise ValueError('End vertex not in graph')
+        if start == end:
+            return Path([start])
+        forward, backward = {start: None}, {end: None}
+        forward_frontier, backward_frontier = [start], [end]
+        while forward_frontier and backward_frontier:
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meet = _expand_level(
+                    forward_frontier, self.children, forward, backward)
+            else:
+                backward_frontier, meet = _expand_level(
+                    backward_frontier, self.parents, backward, forward)
+            if meet is not None:
+                tail = _trace(backward, meet).vertices
+                tail.reverse()
+                return Path(_trace(forward, meet).vertices + tail[1:])
         return None
 
-    def dfs_rec_traversal(self, start, reachable=set()):
-        """Recursive depth-first traversal from start.
+    def bfs_distance_matrix(self, sources, targets=None, max_workers=None,
+                            chunksize=16):
+        """Breadth-first distances from many sources, in parallel.
+
+        The graph is converted once to compressed sparse row arrays, which
+        are sent to each worker process when it starts, so only vertex ids
+        and distance rows cross process boundaries afterwards.
+
+        Parameters
+        ----------
+        sources: iterable of Vertexs
+            Vertices to find distances from
+        targets: iterable of Vertexs, default None
+            Vertices to find distances to. By default all vertices, in the
+            order of self.vertices.
+        max_workers: int, default None
+            Number of worker processes. By default the number of processors.
+            With 1 the distances are computed in this process.
+        chunksize: int, default 16
+            Number of sources sent to a worker at a time.
+
+        Returns
+        -------
+        distances: list of arrays
+            One integer array per source, giving the number of edges on a
+            shortest path to each target, or -1 if there is no path.
+        """
+        csr = self if isinstance(self, CSRGraph) else \
+            CSRGraph.from_dirgraph(self)
+        ids = csr.ids
+        source_ids = []
+        for source in sources:
+            if source not in ids:
+                raise ValueError('Source vertex not in graph')
+            source_ids.append(ids[source])
+        if targets is None:
+            target_ids = None
+        else:
+            target_ids = array('q')
+            for target in targets:
+                if target not in ids:
+                    raise ValueError('Target vertex not in graph')
+                target_ids.append(ids[target])
+        # memory-mapped arrays can't be sent to workers
+        graph = (array('q', csr.offsets), array('q', csr.targets), target_ids)
+        chunks = [source_ids[i:i + chunksize]
+                  for i in range(0, len(source_ids), chunksize)]
+        if max_workers == 1:
+            results = [_bfs_distance_rows(graph, chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers,
+                                     initializer=_init_distance_worker,
+                                     initargs=graph) as executor:
+                results = list(executor.map(_distance_rows, chunks))
+        return [row for rows in results for row in rows]
+
+    def incremental_bfs(self, source):
+        """Track breadth-first distances from source as the graph changes.
+
+        Parameters
+        ----------
+        source: Vertex
+            Vertex to find distances from
+
+        Returns
+        -------
+        tracker: IncrementalBFS
+            Distances from source, updated by edits made through it.
+        """
+        return IncrementalBFS(self, source)
+
+    def k_shortest_paths(self, start, end, k=None):
+        """Yen's algorithm for shortest simple paths in order of length.
+
+        Paths are generated lazily, so only as many searches are run as the
+        caller consumes paths.
 
         Parameters
         ----------
         start: Vertex
             Vertex to start search at
-        reachable: set of Vertexs, default empty
-            set of vertices reachable from start vertex.
+        end: Vertex
+            Vertex to end at
+        k: int, default None
+            Maximum number of paths. By default all simple paths.
+
+        Yields
+        ------
+        path: Path
+            Simple paths from start to end, shortest first.
+        """
+        for vertices, _ in self._yen(start, end, k):
+            yield Path(list(vertices))
+
+    def _yen(self, start, end, k=None):
+        """Yen's algorithm for least cost simple paths.
+
+        Each new path is found by leaving the previous one at some spur
+        vertex, searching from there to end without reusing the root of the
+        path before the spur or any edge out of the spur taken by a path
+        already found with the same root, and taking the cheapest of all
+        candidates found so far.
+
+        The least cost from every vertex to end is computed once, by a
+        search over reversed edges, and shared by all the spur searches.
+        Blocking vertices and edges can only make paths costlier, so these
+        costs are an exact lower bound for A* search: a spur search whose
+        shortest route to end is not blocked goes straight down it, and
+        vertices that cannot reach end are never entered.
+
+        Parameters
+        ----------
+        start: Vertex
+            Vertex to start search at
+        end: Vertex
+            Vertex to end at
+        k: int, default None
+            Maximum number of paths. By default all simple paths.
+
+        Yields
+        ------
+        vertices, costs: tuple, tuple
+            Vertices of each path and the cost of reaching each of them.
+        """
+        if start not in self:
+            raise ValueError('Start vertex not in graph')
+        if end not in self:
+            raise ValueError('End vertex not in graph')
+        to_end = self._costs_to(end)
+        path = self._spur_path(start, end, set(), {}, to_end)
+        found = []
+        candidates = []
+        seen = set()
+        tiebreak = count()
+        while path is not None and (k is None or len(found) < k):
+            found.append(path)
+            yield path
+            vertices, costs = path
+            for i in range(len(vertices) - 1):
+                root = vertices[:i + 1]
+                blocked_edges = {vertices[i]: {other[i + 1]
+                                               for other, _ in found
+                                               if other[:i + 1] == root}}
+                spur = self._spur_path(vertices[i], end, set(root[:-1]),
+                                       blocked_edges, to_end)
+                if spur is None:
+                    continue
+                spur_vertices, spur_costs = spur
+                candidate = root[:-1] + spur_vertices
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                candidate_costs = costs[:i] + tuple(costs[i] + cost
+                                                    for cost in spur_costs)
+                heapq.heappush(candidates, (candidate_costs[-1],
+                                            len(candidate), next(tiebreak),
+                                            candidate, candidate_costs))
+            path = None
+            if candidates:
+                path = heapq.heappop(candidates)[-2:]
+
+    def _spur_path(self, spur, end, blocked_vertices, blocked_edges,
+                   to_end):
+        """A* least cost path avoiding some vertices and edges.
+
+        Parameters
+        ----------
+        spur: Vertex
+            Vertex to start search at
+        end: Vertex
+            Vertex to end at
+        blocked_vertices: set of Vertexs
+            Vertices the search may not enter.
+        blocked_edges: dict
+            Keys are vertices and values are sets of children the search may
+            not move to from them.
+        to_end: dict
+            Least cost from each vertex that can reach end to end, ignoring
+            blocked vertices and edges.
+
+        Returns
+        -------
+        vertices, costs: tuple, tuple
+            Vertices of least cost path and their costs from spur, None if
+            there is no path.
+        """
+        if spur not in to_end:
+            return None
+        dist, parents = {spur: 0}, {spur: None}
+        settled = set()
+        # among equal estimates prefer vertices further along, then counter
+        # breaks ties so vertices are never compared
+        tiebreak = count()
+        heap = [(to_end[spur], 0, next(tiebreak), spur)]
+        while heap:
+            _, _, _, vertex = heapq.heappop(heap)
+            if vertex in settled:
+                continue
+            if vertex == end:
+                break
+            settled.add(vertex)
+            skip = blocked_edges.get(vertex, ())
+            for child, weight in self._edge_costs(vertex):
+                if child not in to_end or child in blocked_vertices or \
+                        child in skip:
+                    continue
+                cost = dist[vertex] + weight
+                if child not in dist or cost < dist[child]:
+                    dist[child] = cost
+                    parents[child] = vertex
+                    heapq.heappush(heap, (cost + to_end[child], -cost,
+                                          next(tiebreak), child))
+        if end not in parents:
+            return None
+        vertices = tuple(_trace(parents, end))
+        return vertices, tuple(dist[vertex] for vertex in vertices)
+
+    def _costs_to(self, end):
+        """Least number of edges from each vertex to end.
+
+        Parameters
+        ----------
+        end: Vertex
+            Vertex to end at
+
+        Returns
+        -------
+        to_end: dict
+            Keys are the vertices that can reach end and values the number
+            of edges on a shortest path from them to end.
+        """
+        to_end = {end: 0}
+        queue = deque([end])
+        while queue:
+            vertex = queue.popleft()
+            for parent in self.parents(vertex):
+                if parent not in to_end:
+                    to_end[parent] = to_end[vertex] + 1
+                    queue.append(parent)
+        return to_end
+
+    def _edge_costs(self, vertex):
+        """Get (child, cost) pairs of edges out of vertex, cost 1 here."""
+        return ((child, 1) for child in self.children(vertex))
+
+    def reachability_index(self):
+        """Build index answering reachability queries in constant time.
+
+        The index is a snapshot and must be rebuilt after the graph changes.
+
+        Returns
+        -------
+        index: ReachabilityIndex
+            Transitive closure of graph.
+        """
+        return ReachabilityIndex(self)
+
+    def strongly_connected_components(self):
+        """Iterative Tarjan's algorithm for strongly connected components.
+
+        Runs in O(V + E) time with explicit stacks instead of recursion.
+
+        Returns
+        -------
+        components: list
+            List of lists of vertices, one for each strongly connected
+            component. A component comes after every component reachable
+            from it, so the list is in reverse topological order.
+        """
+        index, low = {}, {}
+        stack, on_stack = [], set()
+        components = []
+        for root in self.vertices:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.children(root)))]
+            while work:
+                vertex, children = work[-1]
+                child = next(children, None)
+                if child is None:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[vertex])
+                    # vertex is the root of a component
+                    if low[vertex] == index[vertex]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == vertex:
+                                break
+                        components.append(component)
+                elif child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(self.children(child))))
+                elif child in on_stack:
+                    low[vertex] = min(low[vertex], index[child])
+        return components
+
+    def topological_sort(self):
+        """Kahn's algorithm for topological order of vertices.
+
+        Raises
+        ------
+        ValueError
+            Graph has a cycle
+
+        Returns
+        -------
+        order: list
+            List of all vertices, each before all of its children.
+        """
+        indegree = dict.fromkeys(self.vertices, 0)
+        for vertex in indegree:
+            for child in self.children(vertex):
+                indegree[child] += 1
+        queue = deque(vertex for vertex, degree in indegree.items()
+                      if degree == 0)
+        order = []
+        while queue:
+            vertex = queue.popleft()
+            order.append(vertex)
+            for child in self.children(vertex):
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    queue.append(child)
+        if len(order) != len(indegree):
+            raise ValueError('Graph has a cycle')
+        return order
+
+    def condensation(self):
+        """Build graph of strongly connected components.
+
+        Returns
+        -------
+        dag: DirGraphProcess
+            Acyclic graph with one vertex per strongly connected component,
+            whose data is the tuple of vertices in the component, and an edge
+            between components joined by at least one edge. Vertices are in
+            topological order.
+        """
+        components = self.strongly_connected_components()
+        components.reverse()
+        vertices = [Vertex(tuple(component)) for component in components]
+        component = {vertex: i for i, members in enumerate(components)
+                     for vertex in members}
+        edges = ((vertices[i], vertices[component[child]])
+                 for i, members in enumerate(components)
+                 for vertex in members for child in self.children(vertex)
+                 if component[child] != i)
+        return DirGraphProcess.from_edges(edges, vertices, dedup=True)
+
+    def _bfs_parents(self, start, ends=None):
+        """Breadth-first search tree from start.
+
+        Parameters
+        ----------
+        start: Vertex
+            Vertex to start search at
+        ends: set of Vertexs, default None
+            Stop once all of these vertices are reached. By default search
+            all vertices reachable from start.
+
+        Returns
+        -------
+        parents: dict
+            Keys are the vertices reached and values their parent in the
+            search tree, None for start.
+        """
+        parents = {start: None}
+        remaining = None if ends is None else set(ends) - {start}
+        queue = deque([start])
+        while queue and remaining != set():
+            vertex = queue.popleft()
+            for child in self.children(vertex):
+                if child not in parents:
+                    parents[child] = vertex
+                    queue.append(child)
+                    if remaining is not None:
+                        remaining.discard(child)
+        return parents
+
+    def dfs_rec_traversal(self, start, reachable=None):
+        """Depth-first traversal from start.
+
+        Kept for compatibility with earlier versions, which recursed once
+        per vertex. The traversal is now the iterative dfs_preorder.
+
+        Parameters
+        ----------
+        start: Vertex
+            Vertex to start search at
+        reachable: set of Vertexs, default None
+            Vertices already found, which are not expanded again. Updated in
+            place.
 
         Returns
         -------
         reachable: set of Vertexs
             set of vertices reachable from start vertex
         """
-        reachable.add(start)
-        for vertex in self.children(start):
-            if vertex not in reachable:
-                reachable = self.dfs_rec_traversal(vertex, reachable)
+        if reachable is None:
+            reachable = set()
+        for _ in self.dfs_preorder(start, reachable):
+            pass
         return reachable
 
-    def dfs_it_traversal(self, start, reachable=set()):
-        """Recursive depth-first traversal from start.
+    def dfs_it_traversal(self, start, reachable=None):
+        """Iterative depth-first traversal from start.
 
         Parameters
         ----------
         start: Vertex
             Vertex to start search at
-        reachable: set of Vertexs, default empty
-            set of vertices reachable from start vertex.
+        reachable: set of Vertexs, default None
+            Vertices already found, which are not expanded again. Updated in
+            place.
 
         Returns
         -------
         reachable: set of Vertexs
             set of vertices reachable from start vertex
         """
-        stack = [start]
-        while stack:
-            vertex = stack.pop()
-            if vertex not in reachable:
-                reachable.add(vertex)
-                for child in self.children(vertex):
-                    stack += [child]
-        return reachable
+        return self.dfs_rec_traversal(start, reachable)
 
     def bfs_it_traversal(self, start):
         """Iterative breadth-first search traversal from start.
@@ -167,6 +748,1016 @@ class DirGraphProcess(DirGraph):
         Returns
         -------
         traversal: list of Vertexs
-            List of vertices reachable from start vertex.
+            List of vertices reachable from start vertex, in order of
+            distance from start.
+        """
+        return list(self.bfs_traversal(start))
+
+    def dfs_preorder(self, start, visited=None):
+        """Lazy depth-first traversal yielding vertices when first reached.
+
+        Uses an explicit stack of child iterators, so memory is proportional
+        to the depth of the search and there is no recursion.
+
+        Parameters
+        ----------
+        start: Vertex
+            Vertex to start search at
+        visited: set of Vertexs, default None
+            Vertices to treat as already visited. Updated in place.
+
+        Yields
+        ------
+        vertex: Vertex
+            Vertices reachable from start in depth-first preorder.
+        """
+        if start not in self:
+            raise ValueError('Start vertex not in graph')
+        if visited is None:
+            visited = set()
+        return self._dfs_preorder(start, visited)
+
+    def _dfs_preorder(self, start, visited):
+        """Generator for dfs_preorder, with start in graph."""
+        if start in visited:
+            return
+        visited.add(start)
+        yield start
+        stack = [iter(self.children(start))]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+            elif child not in visited:
+                visited.add(child)
+                yield child
+                stack.append(iter(self.children(child)))
+
+    def dfs_postorder(self, start, visited=None):
+        """Lazy depth-first traversal yielding vertices when finished.
+
+        A vertex is yielded once all vertices reachable from it have been
+        yielded or were already on the search stack.
+
+        Parameters
+        ----------
+        start: Vertex
+            Vertex to start search at
+        visited: set of Vertexs, default None
+            Vertices to treat as already visited. Updated in place.
+
+        Yields
+        ------
+        vertex: Vertex
+            Vertices reachable from start in depth-first postorder.
+        """
+        if start not in self:
+            raise ValueError('Start vertex not in graph')
+        if visited is None:
+            visited = set()
+        return self._dfs_postorder(start, visited)
+
+    def _dfs_postorder(self, start, visited):
+        """Generator for dfs_postorder, with start in graph."""
+        if start in visited:
+            return
+        visited.add(start)
+        stack = [(start, iter(self.children(start)))]
+        while stack:
+            vertex, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                yield vertex
+            elif child not in visited:
+                visited.add(child)
+                stack.append((child, iter(self.children(child))))
+
+    def bfs_traversal(self, start):
+        """Lazy breadth-first traversal from start.
+
+        Parameters
+        ----------
+        start: Vertex
+            Vertex to start search at
+
+        Yields
+        ------
+        vertex: Vertex
+            Vertices reachable from start in order of distance from start.
+        """
+        return chain.from_iterable(self.bfs_levels(start))
+
+    def bfs_levels(self, start):
+        """Lazy breadth-first traversal from start, one level at a time.
+
+        Parameters
+        ----------
+        start: Vertex
+            Vertex to start search at
+
+        Yields
+        ------
+        level: list of Vertexs
+            Vertices at distance 0, 1, 2, ... from start.
+        """
+        if start not in self:
+            raise ValueError('Start vertex not in graph')
+        return self._bfs_levels(start)
+
+    def _bfs_levels(self, start):
+        """Generator for bfs_levels, with start in graph."""
+        visited = {start}
+        level = [start]
+        while level:
+            yield level
+            next_level = []
+            for vertex in level:
+                for child in self.children(vertex):
+                    if child not in visited:
+                        visited.add(child)
+                        next_level.append(child)
+            level = next_level
+
+
+class IncrementalBFS:
+    """Breadth-first distances from a source kept up to date under edits.
+
+    Edges and vertices must be added and removed through the tracker, which
+    edits the graph and then repairs only the distances that change. An
+    insertion lowers distances in a search outward from the new child. A
+    deletion first finds the vertices left with no parent one step closer
+    to the source, then recomputes their distances from their remaining
+    parents with a best-first search. In an undirected graph both ends of
+    an edge are repaired. The tracker records the version of the graph, and
+    raises an error if the graph was changed without going through it.
+
+    Parameters
+    ----------
+    graph: DirGraph
+        Graph to track.
+    source: Vertex
+        Vertex to find distances from.
+
+    Attributes
+    ----------
+    source: Vertex
+        Vertex distances are from.
+    distances: dict
+        Keys are the vertices reachable from source and values are the
+        number of edges on a shortest path to them.
+    """
+
+    def __init__(self, graph, source):
+        """Class constructor."""
+        if source not in graph:
+            raise ValueError('Source vertex not in graph')
+        self._graph = graph
+        self._source = source
+        self._dist = {vertex: depth
+                      for depth, level in enumerate(graph.bfs_levels(source))
+                      for vertex in level}
+        self._version = graph.version
+
+    @property
+    def source(self):
+        """Get source vertex."""
+        return self._source
+
+    @property
+    def distances(self):
+        """Get copy of distances from source."""
+        self._check_version()
+        return dict(self._dist)
+
+    def distance(self, vertex):
+        """Get distance from source.
+
+        Parameters
+        ----------
+        vertex: Vertex
+            Vertex to get distance to
+
+        Returns
+        -------
+        dist: int
+            Number of edges on a shortest path from source, None if vertex
+            can't be reached.
+        """
+        self._check_version()
+        if vertex not in self._graph:
+            raise ValueError('Vertex not in graph')
+        return self._dist.get(vertex)
+
+    def addvertex(self, vertex):
+        """Add vertex to graph.
+
+        Parameters
+        ----------
+        vertex: Vertex
+            Vertex to add, unreachable until an edge to it is added.
+        """
+        self._check_version()
+        self._graph.addvertex(vertex)
+        self._version = self._graph.version
+
+    def addedge(self, parent, child):
+        """Add edge to graph and lower distances it shortens.
+
+        Parameters
+        ----------
+        parent: Node
+            Node edge starts from.
+        child: Node
+            Node edge ends at.
+        """
+        self._check_version()
+        self._graph.addedge(parent, child)
+        self._version = self._graph.version
+        self._relax(parent, child)
+        if isinstance(self._graph, Graph):
+            self._relax(child, parent)
+
+    def removeedge(self, parent, child):
+        """Remove edge from graph and raise distances it lengthens.
+
+        Parameters
+        ----------
+        parent: Node
+            Node edge starts from.
+        child: Node
+            Node edge ends at.
+        """
+        self._check_version()
+        self._graph.removeedge(parent, child)
+        self._version = self._graph.version
+        dist = self._dist
+        candidates = []
+        if parent in dist and dist.get(child) == dist[parent] + 1:
+            candidates.append(child)
+        if isinstance(self._graph, Graph) and child in dist and \
+                dist.get(parent) == dist[child] + 1:
+            candidates.append(parent)
+        self._repair(candidates)
+
+    def removevertex(self, vertex):
+        """Remove vertex from graph and raise distances it lengthens.
+
+        Parameters
+        ----------
+        vertex: Vertex
+            Vertex to remove, other than source.
+        """
+        self._check_version()
+        if vertex == self._source:
+            raise ValueError('Cannot remove source vertex')
+        dist = self._dist
+        children = []
+        if vertex in dist:
+            children = [child for child in self._graph.children(vertex)
+                        if dist.get(child) == dist[vertex] + 1]
+        self._graph.removevertex(vertex)
+        self._version = self._graph.version
+        dist.pop(vertex, None)
+        self._repair(children)
+
+    def _check_version(self):
+        """Raise error if graph was changed without going through tracker."""
+        if self._graph.version != self._version:
+            raise ValueError('Graph changed outside of tracker')
+
+    def _relax(self, parent, child):
+        """Lower distances shortened by edge from parent to child."""
+        dist = self._dist
+        if parent not in dist:
+            return
+        if child in dist and dist[child] <= dist[parent] + 1:
+            return
+        dist[child] = dist[parent] + 1
+        queue = deque([child])
+        while queue:
+            vertex = queue.popleft()
+            for grandchild in self._graph.children(vertex):
+                if grandchild not in dist or \
+                        dist[grandchild] > dist[vertex] + 1:
+                    dist[grandchild] = dist[vertex] + 1
+                    queue.append(grandchild)
+
+    def _repair(self, candidates):
+        """Recompute distances of vertices that may have lost their parent.
+
+        Parameters
+        ----------
+        candidates: list
+            Vertices whose parent one step closer to source was removed.
+        """
+        dist = self._dist
+        graph = self._graph
+        # find vertices with no remaining parent one step closer, level by
+        # level so parents are decided before their children
+        affected = set()
+        checked = set()
+        queue = deque(sorted(set(candidates), key=dist.get))
+        while queue:
+            vertex = queue.popleft()
+            if vertex in checked:
+                continue
+            checked.add(vertex)
+            if any(parent not in affected and
+                   dist.get(parent) == dist[vertex] - 1
+                   for parent in graph.parents(vertex)):
+                continue
+            affected.add(vertex)
+            queue.extend(child for child in graph.children(vertex)
+                         if dist.get(child) == dist[vertex] + 1)
+        for vertex in affected:
+            del dist[vertex]
+        # best-first search over affected vertices from unaffected parents
+        tentative = {}
+        tiebreak = count()
+        heap = []
+        for vertex in affected:
+            best = min((dist[parent] + 1 for parent in graph.parents(vertex)
+                        if parent in dist), default=None)
+            if best is not None:
+                tentative[vertex] = best
+                heap.append((best, next(tiebreak), vertex))
+        heapq.heapify(heap)
+        while heap:
+            depth, _, vertex = heapq.heappop(heap)
+            if vertex in dist:
+                continue
+            dist[vertex] = depth
+            for child in graph.children(vertex):
+                if child in affected and child not in dist and \
+                        depth + 1 < tentative.get(child, depth + 2):
+                    tentative[child] = depth + 1
+                    heapq.heappush(heap, (depth + 1, next(tiebreak), child))
+
+
+class ReachabilityIndex:
+    """Transitive closure of a directed graph stored as bitsets.
+
+    The graph is condensed into its strongly connected components, since
+    all vertices in a component reach the same vertices. Components are then
+    visited in reverse topological order and the set of components each one
+    reaches is built as the union of those of its children, stored as a
+    packed bitset with one bit per component.
+
+    Parameters
+    ----------
+    graph: DirGraphProcess
+        Graph to index.
+
+    Attributes
+    ----------
+    components: list
+        List of lists of vertices in each strongly connected component, in
+        reverse topological order.
+    """
+
+    def __init__(self, graph):
+        """Class constructor."""
+        self._components = graph.strongly_connected_components()
+        self._component = {vertex: i
+                           for i, component in enumerate(self._components)
+                           for vertex in component}
+        nbytes = (len(self._components) + 7) // 8
+        rows = []
+        for i, component in enumerate(self._components):
+            row = 1 << i
+            for vertex in component:
+                for child in graph.children(vertex):
+                    j = self._component[child]
+                    if j != i:
+                        row |= rows[j]
+            rows.append(row)
+        # bytes rows allow constant time bit lookup
+        self._rows = [row.to_bytes(nbytes, 'little') for row in rows]
+
+    @property
+    def components(self):
+        """Get strongly connected components."""
+        return self._components
+
+    def reachable(self, start, end):
+        """Check if there is a path from start to end.
+
+        Parameters
+        ----------
+        start: Vertex
+            Vertex path starts at
+        end: Vertex
+            Vertex path ends at
+
+        Returns
+        -------
+        reachable: bool
+            True if end can be reached from start. Every vertex can reach
+            itself.
+        """
+        if start not in self._component:
+            raise ValueError('Start vertex not in graph')
+        if end not in self._component:
+            raise ValueError('End vertex not in graph')
+        i, j = self._component[start], self._component[end]
+        return bool(self._rows[i][j >> 3] >> (j & 7) & 1)
+
+    def descendants(self, starts):
+        """Get all vertices reachable from any of several vertices.
+
+        Parameters
+        ----------
+        starts: iterable of Vertexs
+            Vertices to start from
+
+        Returns
+        -------
+        reachable: set of Vertexs
+            Vertices reachable from at least one of starts, including starts.
+        """
+        row = 0
+        for start in starts:
+            if start not in self._component:
+                raise ValueError('Start vertex not in graph')
+            row |= int.from_bytes(self._rows[self._component[start]],
+                                  'little')
+        reachable = set()
+        while row:
+            # index of lowest set bit
+            low_bit = row & -row
+            reachable.update(self._components[low_bit.bit_length() - 1])
+            row ^= low_bit
+        return reachable
+
+
+# graph arrays of a distance worker process, set by _init_distance_worker
+_distance_graph = None
+
+
+def _init_distance_worker(offsets, targets, target_ids):
+    """Store graph arrays in a distance worker process."""
+    global _distance_graph
+    _distance_graph = (offsets, targets, target_ids)
+
+
+def _distance_rows(source_ids):
+    """Breadth-first distances from each of source_ids in worker graph."""
+    return _bfs_distance_rows(_distance_graph, source_ids)
+
+
+def _bfs_distance_rows(graph, source_ids):
+    """Breadth-first distances from each of source_ids.
+
+    Parameters
+    ----------
+    graph: tuple
+        Compressed sparse row offsets and targets arrays, and array of ids
+        of vertices to find distances to or None for all vertices
+    source_ids: list
+        Ids of vertices to find distances from
+
+    Returns
+    -------
+    rows: list of arrays
+        Distances to the target ids, -1 where there is no path.
+    """
+    offsets, targets, target_ids = graph
+    rows = []
+    for source in source_ids:
+        dist = array('q', [-1]) * (len(offsets) - 1)
+        dist[source] = 0
+        queue = [source]
+        # the for loop also visits vertices appended while it runs
+        for vertex in queue:
+            child_dist = dist[vertex] + 1
+            for child in targets[offsets[vertex]:offsets[vertex + 1]]:
+                if dist[child] < 0:
+                    dist[child] = child_dist
+                    queue.append(child)
+        if target_ids is not None:
+            dist = array('q', (dist[i] for i in target_ids))
+        rows.append(dist)
+    return rows
+
+
+def _trace(parents, end):
+    """Build path to end from search tree parent pointers.
+
+    Parameters
+    ----------
+    parents: dict
+        Keys are vertices and values are their parent in the search tree,
+        None for the root.
+    end: Vertex
+        Last vertex of path
+
+    Returns
+    -------
+    path: Path
+        Path from root to end, None if end is not in the search tree.
+    """
+    if end not in parents:
+        return None
+    vertices = []
+    while end is not None:
+        vertices.append(end)
+        end = parents[end]
+    vertices.reverse()
+    return Path(vertices)
+
+
+def _expand_level(frontier, neighbors, visited, other_visited):
+    """Expand one level of a breadth-first search.
+
+    Parameters
+    ----------
+    frontier: list
+        Vertices at the current level
+    neighbors: function
+        Function returning the vertices adjacent to a vertex
+    visited: dict
+        Search tree parent pointers of this search, updated in place
+    other_visited: dict
+        Search tree parent pointers of the opposite search
+
+    Returns
+    -------
+    next_frontier, meet: list, Vertex
+        Vertices at the next level and the first vertex found that was
+        visited by the opposite search, None if there is none.
+    """
+    next_frontier = []
+    for vertex in frontier:
+        for neighbor in neighbors(vertex):
+            if neighbor not in visited:
+                visited[neighbor] = vertex
+                if neighbor in other_visited:
+                    return next_frontier, neighbor
+                next_frontier.append(neighbor)
+    return next_frontier, None
+
+
+class CSRGraphProcess(CSRGraph, DirGraphProcess):
+    """Graph processing algorithms for compressed sparse row graph class.
+
+    The breadth-first and depth-first searches the other algorithms are
+    built on walk the offsets and targets arrays by vertex id, instead of
+    building a list of child vertices for every vertex expanded, and only
+    map ids back to vertices for their results.
+    """
+
+    def _bfs_parents(self, start, ends=None):
+        """Override parent class method to search by vertex id."""
+        ids, vertex_list = self._ids, self._vertex_list
+        offsets, targets = self._offsets, self._targets
+        i = ids[start]
+        remaining = None
+        if ends is not None and all(end in ids for end in ends):
+            remaining = {ids[end] for end in ends} - {i}
+        # parent id of each vertex reached, -1 if not reached
+        parent_ids = array('q', [-1]) * len(vertex_list)
+        parent_ids[i] = i
+        queue = [i]
+        head = 0
+        while head < len(queue) and remaining != set():
+            i = queue[head]
+            head += 1
+            for j in targets[offsets[i]:offsets[i + 1]]:
+                if parent_ids[j] < 0:
+                    parent_ids[j] = i
+                    queue.append(j)
+                    if remaining is not None:
+                        remaining.discard(j)
+        parents = {vertex_list[queue[0]]: None}
+        for j in queue[1:]:
+            parents[vertex_list[j]] = vertex_list[parent_ids[j]]
+        return parents
+
+    def _bfs_levels(self, start):
+        """Override parent class method to search by vertex id."""
+        vertex_list = self._vertex_list
+        offsets, targets = self._offsets, self._targets
+        visited = bytearray(len(vertex_list))
+        level = [self._ids[start]]
+        visited[level[0]] = 1
+        while level:
+            yield [vertex_list[i] for i in level]
+            next_level = []
+            for i in level:
+                for j in targets[offsets[i]:offsets[i + 1]]:
+                    if not visited[j]:
+                        visited[j] = 1
+                        next_level.append(j)
+            level = next_level
+
+    def _dfs_preorder(self, start, visited):
+        """Override parent class method to search by vertex id."""
+        if start in visited:
+            return
+        vertex_list = self._vertex_list
+        offsets, targets = self._offsets, self._targets
+        visited.add(start)
+        yield start
+        i = self._ids[start]
+        # ids already checked against visited
+        seen = bytearray(len(vertex_list))
+        seen[i] = 1
+        # next position in targets and end of children for vertices on stack
+        positions, stops = [offsets[i]], [offsets[i + 1]]
+        while positions:
+            pos = positions[-1]
+            if pos == stops[-1]:
+                positions.pop()
+                stops.pop()
+                continue
+            positions[-1] = pos + 1
+            j = targets[pos]
+            if seen[j]:
+                continue
+            seen[j] = 1
+            child = vertex_list[j]
+            if child not in visited:
+                visited.add(child)
+                yield child
+                positions.append(offsets[j])
+                stops.append(offsets[j + 1])
+
+
+class GraphProcess(Graph, DirGraphProcess):
+    """Graph processing algorithms for undirected graph class.
+
+    Connected components are kept in a union-find structure over vertex ids,
+    built on first use and then updated as vertices and edges are added, so
+    counts stay current while edges stream in. Any other change to the
+    graph, such as a removal, is detected from the graph version and makes
+    the next query rebuild it.
+    """
+
+    def addvertex(self, vertex):
+        """Override parent class method to keep components current.
+
+        Parameters
+        ----------
+        vertex: Vertex
+            Vertex to add to graph. Has no children by default
+        """
+        current = self._components_current()
+        super().addvertex(vertex)
+        if current:
+            self._component_ids[vertex] = self._components.add()
+            self._components_version = self.version
+
+    def _link(self, parent, child, *args):
+        """Add edge without checks and merge components of its ends."""
+        current = self._components_current()
+        super()._link(parent, child, *args)
+        if current:
+            ids = self._component_ids
+            self._components.union(ids[parent], ids[child])
+            self._components_version = self.version
+
+    def connected_components(self):
+        """Label vertices by connected component using union-find.
+
+        Returns
+        -------
+        labels: array
+            Integer array with the component label of each vertex, in the
+            order of self.vertices. Labels are 0, 1, ... numbered in order
+            of the first vertex of each component.
+        """
+        return self._current_components().labels()
+
+    def component_count(self):
+        """Get number of connected components.
+
+        Returns
+        -------
+        count: int
+            Number of connected components, counting isolated vertices.
+        """
+        return self._current_components().count
+
+    def _components_current(self):
+        """Check if union-find structure reflects graph."""
+        return getattr(self, '_components', None) is not None and \
+            self._components_version == self.version
+
+    def _current_components(self):
+        """Get union-find structure of components, rebuilding if stale."""
+        if not self._components_current():
+            ids = {vertex: i for i, vertex in enumerate(self.adj)}
+            components = UnionFind(len(ids))
+            # each edge is stored in both directions, so union it once
+            components.union_edges((i, ids[child])
+                                   for vertex, i in ids.items()
+                                   for child in self.adj[vertex]
+                                   if ids[child] < i)
+            self._component_ids = ids
+            self._components = components
+            self._components_version = self.version
+        return self._components
+
+
+class WeightedDirGraphProcess(WeightedDirGraph, DirGraphProcess):
+    """Graph processing algorithms for weighted directed graph class."""
+
+    def dijkstra_shortpath(self, start, end):
+        """Dijkstra's algorithm for least cost path between two vertices.
+
+        Edge weights must be non-negative.
+
+        Parameters
+        ----------
+        start: Vertex
+            Vertex to start search at
+        end: Vertex
+            Vertex to end at
+
+        Returns
+        -------
+        shortpath, cost: Path, float
+            Least cost path from start to end and its total weight, None and
+            infinity if there is no path.
+        """
+        return self.astar_shortpath(start, end)
+
+    @_cached
+    def astar_shortpath(self, start, end, heuristic=None):
+        """A* search for least cost path between two vertices.
+
+        Edge weights must be non-negative. The path is guaranteed to be
+        least cost if the heuristic is consistent, that is it never
+        overestimates the cost to end and never drops by more than the weight
+        of an edge between neighbors.
+
+        Parameters
+        ----------
+        start: Vertex
+            Vertex to start search at
+        end: Vertex
+            Vertex to end at
+        heuristic: function, default None
+            Function taking a vertex and end and returning an estimate of
+            the cost of a path between them. By default zero, which makes
+            the search Dijkstra's algorithm.
+
+        Returns
+        -------
+        shortpath, cost: Path, float
+            Least cost path from start to end and its total weight, None and
+            infinity if there is no path.
+        """
+        if start not in self:
+            raise ValueError('Start vertex not in graph')
+        if end not in self:
+            raise ValueError('End vertex not in graph')
+        dist, parents = self._heap_search(start, end, heuristic)
+        return _trace(parents, end), dist.get(end, float('inf'))
+
+    def dijkstra_distances(self, start):
+        """Dijkstra's algorithm for least cost to every reachable vertex.
+
+        Parameters
+        ----------
+        start: Vertex
+            Vertex to start search at
+
+        Returns
+        -------
+        dist: dict
+            Keys are the vertices reachable from start and values the least
+            cost of a path to them.
+        """
+        if start not in self:
+            raise ValueError('Start vertex not in graph')
+        dist, _ = self._heap_search(start)
+        return dist
+
+    def k_shortest_paths(self, start, end, k=None):
+        """Yen's algorithm for least cost simple paths in order of cost.
+
+        Paths are generated lazily, so only as many searches are run as the
+        caller consumes paths. Edge weights must be non-negative.
+
+        Parameters
+        ----------
+        start: Vertex
+            Vertex to start search at
+        end: Vertex
+            Vertex to end at
+        k: int, default None
+            Maximum number of paths. By default all simple paths.
+
+        Yields
+        ------
+        path, cost: Path, float
+            Simple paths from start to end and their total weights, least
+            cost first.
+        """
+        for vertices, costs in self._yen(start, end, k):
+            yield Path(list(vertices)), costs[-1]
+
+    def _costs_to(self, end):
+        """Override parent class method with Dijkstra over reversed edges.
+
+        Parameters
+        ----------
+        end: Vertex
+            Vertex to end at
+
+        Raises
+        ------
+        ValueError
+            Negative edge weight
+
+        Returns
+        -------
+        to_end: dict
+            Keys are the vertices that can reach end and values the least
+            cost of a path from them to end.
+        """
+        adj, weights = self.adj, self.weights
+        reverse = {vertex: [] for vertex in adj}
+        for vertex, children in adj.items():
+            vertex_weights = weights[vertex]
+            if vertex_weights and min(vertex_weights) < 0:
+                raise ValueError('Negative edge weight')
+            for child, weight in zip(children, vertex_weights):
+                reverse[child].append((vertex, weight))
+        to_end = {}
+        tiebreak = count()
+        heap = [(0.0, next(tiebreak), end)]
+        while heap:
+            cost, _, vertex = heapq.heappop(heap)
+            if vertex in to_end:
+                continue
+            to_end[vertex] = cost
+            for parent, weight in reverse[vertex]:
+                if parent not in to_end:
+                    heapq.heappush(heap, (cost + weight, next(tiebreak),
+                                          parent))
+        return to_end
+
+    def _edge_costs(self, vertex):
+        """Override parent class method with edge weights as costs."""
+        return zip(self.adj[vertex], self.weights[vertex])
+
+    def _heap_search(self, start, end=None, heuristic=None,
+                     blocked_vertices=(), blocked_edges=None):
+        """Best-first search with a binary heap.
+
+        Vertices are pushed again when their cost improves and stale heap
+        entries are skipped when popped, instead of decreasing keys.
+
+        Parameters
+        ----------
+        start: Vertex
+            Vertex to start search at
+        end: Vertex, default None
+            Stop once end is settled. By default settle all vertices
+            reachable from start.
+        heuristic: function, default None
+            Function taking a vertex and end and returning an estimate of
+            the cost of a path between them.
+        blocked_vertices: set of Vertexs, default empty
+            Vertices the search may not enter.
+        blocked_edges: dict, default None
+            Keys are vertices and values are sets of children the search may
+            not move to from them.
+
+        Returns
+        -------
+        dist, parents: dict, dict
+            Least cost to and search tree parent of each vertex reached.
+            Costs of vertices not yet settled when stopping at end are
+            upper bounds.
+        """
+        dist, parents = {start: 0.0}, {start: None}
+        settled = set()
+        # counter breaks ties so vertices are never compared
+        tiebreak = count()
+        heap = [(0.0, next(tiebreak), start)]
+        while heap:
+            _, _, vertex = heapq.heappop(heap)
+            if vertex in settled:
+                continue
+            if vertex == end:
+                break
+            settled.add(vertex)
+            skip = blocked_edges.get(vertex, ()) if blocked_edges else ()
+            for child, weight in zip(self.adj[vertex], self.weights[vertex]):
+                if weight < 0:
+                    raise ValueError('Negative edge weight')
+                if child in blocked_vertices or child in skip:
+                    continue
+                cost = dist[vertex] + weight
+                if child not in dist or cost < dist[child]:
+                    dist[child] = cost
+                    parents[child] = vertex
+                    priority = cost
+                    if heuristic is not None:
+                        priority += heuristic(child, end)
+                    heapq.heappush(heap, (priority, next(tiebreak), child))
+        return dist, parents
+
+
+class WeightedGraphProcess(WeightedGraph, GraphProcess,
+                           WeightedDirGraphProcess):
+    """Graph processing algorithms for weighted undirected graph class."""
+
+    def kruskal_mst(self):
+        """Kruskal's algorithm for minimum spanning forest.
+
+        Edges are held in parallel arrays of endpoint ids and weights, and
+        their order is sorted by weight once. Union-find then keeps each
+        edge that joins two different trees.
+
+        Returns
+        -------
+        edges, cost: list, float
+            List of (parent, child, weight) triples of the edges in the
+            forest and their total weight. The forest spans every connected
+            component.
+        """
+        vertices, sources, targets, weights = self._edge_arrays()
+        components = UnionFind(len(vertices))
+        tree = []
+        for i in sorted(range(len(weights)), key=weights.__getitem__):
+            if components.union(sources[i], targets[i]):
+                tree.append((vertices[sources[i]], vertices[targets[i]],
+                             weights[i]))
+                if components.count == 1:
+                    break
+        return tree, sum(weight for _, _, weight in tree)
+
+    def prim_mst(self, lazy=True):
+        """Prim's algorithm for minimum spanning forest.
+
+        A tree is grown from each vertex not yet in the forest by repeatedly
+        adding the lightest edge leaving it, found with a binary heap.
+
+        Parameters
+        ----------
+        lazy: bool, default True
+            If True, every edge leaving the tree is pushed on the heap and
+            edges whose far end has since joined the tree are skipped when
+            popped. If False, an edge is only pushed when it is lighter than
+            the best known edge to its far end, which keeps the heap
+            smaller on dense graphs.
+
+        Returns
+        -------
+        edges, cost: list, float
+            List of (parent, child, weight) triples of the edges in the
+            forest and their total weight. The forest spans every connected
+            component.
+        """
+        in_tree = set()
+        best = {}
+        tree = []
+        tiebreak = count()
+        for root in self.vertices:
+            if root in in_tree:
+                continue
+            heap = [(0.0, next(tiebreak), None, root)]
+            while heap:
+                weight, _, parent, vertex = heapq.heappop(heap)
+                if vertex in in_tree:
+                    continue
+                in_tree.add(vertex)
+                if parent is not None:
+                    tree.append((parent, vertex, weight))
+                for child, child_weight in zip(self.adj[vertex],
+                                               self.weights[vertex]):
+                    if child in in_tree:
+                        continue
+                    if not lazy:
+                        if child in best and best[child] <= child_weight:
+                            continue
+                        best[child] = child_weight
+                    heapq.heappush(heap, (child_weight, next(tiebreak),
+                                          vertex, child))
+        return tree, sum(weight for _, _, weight in tree)
+
+    def _edge_arrays(self):
+        """Get each undirected edge once as parallel arrays.
+
+        Returns
+        -------
+        vertices, sources, targets, weights: list, array, array, array
+            Vertices ordered by id, endpoint ids with source less than
+            target, and weight of each edge. Self loops are left out.
         """
-        pass
+        vertices = self.vertices
+        ids = {vertex: i for i, vertex in enumerate(vertices)}
+        sources, targets, weights = array('q'), array('q'), array('d')
+        for i, vertex in enumerate(vertices):
+            for child, weight in zip(self.adj[vertex], self.weights[vertex]):
+                j = ids[child]
+                if i < j:
+                    sources.append(i)
+                    targets.append(j)
+                    weights.append(weight)
+        return vertices, sources, targets, weights
@@ -1,5 +1,11 @@
 """Graph data structures."""
 
+import weakref
+from array import array
+
+# stands for the data of a vertex whose data was deleted
+_MISSING = object()
+
 
 class Vertex:
     """
@@ -14,19 +20,32 @@ class Vertex:
     ----------
     data : obj
         Object stored in the vertex.
-    next_vertex : Vertex
-        Pointer to next vertex.
 
     """
 
+    # no per-instance dict, since graphs may hold millions of vertices
+    __slots__ = ('_data', '_graphs', '__weakref__')
+
     def __init__(self, data):
         """Class constructor."""
         self._data = data
+        # weak reference, or list of them, to graphs indexing this vertex
+        self._graphs = None
 
     def __str__(self):
         """Use node data as string representation."""
         return str(self.data)
 
+    def __getstate__(self):
+        """Drop graph references when pickling."""
+        return {'_data': self._data} if hasattr(self, '_data') else {}
+
+    def __setstate__(self, state):
+        """Restore data when unpickling."""
+        self._graphs = None
+        if '_data' in state:
+            self._data = state['_data']
+
     @property
     def data(self):
         """Get, set, or delete vertex data."""
@@ -34,11 +53,45 @@ class Vertex:
 
     @data.setter
     def data(self, val):
+        old = getattr(self, '_data', _MISSING)
         self._data = val
+        self._notify(old)
 
     @data.deleter
     def data(self):
+        old = self._data
         del self._data
+        self._notify(old)
+
+    def _watch(self, graph):
+        """Register graph to be told when vertex data changes."""
+        refs = self._live_graphs()
+        if not any(ref() is graph for ref in refs):
+            # plain references to a graph are shared by all its vertices
+            refs.append(weakref.ref(graph))
+        self._store_graphs(refs)
+
+    def _notify(self, old):
+        """Tell registered graphs that vertex data changed from old."""
+        refs = self._live_graphs()
+        for ref in refs:
+            graph = ref()
+            if graph is not None:
+                graph._reindex_vertex(self, old)
+        self._store_graphs(refs)
+
+    def _live_graphs(self):
+        """List of weak references to registered graphs still alive."""
+        refs = self._graphs
+        if refs is None:
+            return []
+        if not isinstance(refs, list):
+            refs = [refs]
+        return [ref for ref in refs if ref() is not None]
+
+    def _store_graphs(self, refs):
+        """Store graph references, without a list for a single graph."""
+        self._graphs = refs[0] if len(refs) == 1 else refs or None
 
 
 class Path:
@@ -57,6 +110,8 @@ class Path:
 
     """
 
+    __slots__ = ('_vertices', '__weakref__')
+
     def __init__(self, vertices):
         """Class constructor."""
         self._vertices = vertices
@@ -73,6 +128,10 @@ class Path:
         """Iterate over vertices."""
         return iter(self.vertices)
 
+    def __contains__(self, vertex):
+        """Check if vertex is in path."""
+        return vertex in self.vertices
+
     def __add__(self, other_path):
         """Concatenate paths."""
         return Path(self.vertices + other_path.vertices)
@@ -121,6 +180,210 @@ class Path:
             self.vertices.remove(vertex)
 
 
+class FrozenPath:
+    """
+    Immutable path of vertices in graph.
+
+    Vertices are stored in a tuple together with a set of them, so length
+    and membership checks take constant time. Paths can be hashed and are
+    equal when they have the same vertices.
+
+    Parameters
+    ----------
+    vertices : iterable, default empty
+        Vertices in path
+
+    Attributes
+    ----------
+    vertices : tuple
+        Vertices in path
+
+    """
+
+    __slots__ = ('_vertices', '_members')
+
+    def __init__(self, vertices=()):
+        """Class constructor."""
+        self._vertices = tuple(vertices)
+        self._members = frozenset(self._vertices)
+
+    def __str__(self):
+        """Use node data as string representation."""
+        return str([str(vertex.data) for vertex in self._vertices])
+
+    def __len__(self):
+        """Length of tuple of vertices."""
+        return len(self._vertices)
+
+    def __iter__(self):
+        """Iterate over vertices."""
+        return iter(self._vertices)
+
+    def __contains__(self, vertex):
+        """Check if vertex is in path in constant time."""
+        return vertex in self._members
+
+    def __add__(self, other_path):
+        """Concatenate paths."""
+        return FrozenPath(self._vertices + tuple(other_path))
+
+    def __eq__(self, other_path):
+        """Paths are equal if they have the same vertices."""
+        if not isinstance(other_path, FrozenPath):
+            return NotImplemented
+        return self._vertices == other_path._vertices
+
+    def __hash__(self):
+        """Hash of tuple of vertices."""
+        return hash(self._vertices)
+
+    @property
+    def vertices(self):
+        """Get vertices."""
+        return self._vertices
+
+    def addvertex(self, index, vertex):
+        """Override Path method, path is immutable."""
+        raise ValueError('FrozenPath is immutable')
+
+    def removevertex(self, vertex):
+        """Override Path method, path is immutable."""
+        raise ValueError('FrozenPath is immutable')
+
+
+class LinkedPath:
+    """
+    Persistent path of vertices in graph with structural sharing.
+
+    A path is a chain of cells, each holding its last vertex and a reference
+    to the path before it. Extending a path by a vertex creates one new cell
+    and leaves the original unchanged, so many paths with a common prefix
+    share it instead of each holding a copy. The tuple of vertices is only
+    built, and then cached, when the path is iterated.
+
+    Parameters
+    ----------
+    vertices : iterable, default empty
+        Vertices in path
+
+    Attributes
+    ----------
+    vertices : tuple
+        Vertices in path
+    last : Vertex
+        Last vertex in path, None if path is empty
+    prefix : LinkedPath
+        Path without its last vertex, None if path is empty
+
+    """
+
+    __slots__ = ('_last', '_prefix', '_len', '_vertices')
+
+    def __init__(self, vertices=()):
+        """Class constructor."""
+        self._last, self._prefix, self._len = None, None, 0
+        self._vertices = ()
+        vertices = tuple(vertices)
+        if vertices:
+            prefix = LinkedPath()
+            for vertex in vertices[:-1]:
+                prefix = prefix.extend(vertex)
+            self._last, self._prefix = vertices[-1], prefix
+            self._len = len(vertices)
+            self._vertices = vertices
+
+    def __str__(self):
+        """Use node data as string representation."""
+        return str([str(vertex.data) for vertex in self.vertices])
+
+    def __len__(self):
+        """Number of vertices, stored in each cell."""
+        return self._len
+
+    def __iter__(self):
+        """Iterate over vertices."""
+        return iter(self.vertices)
+
+    def __contains__(self, vertex):
+        """Check if vertex is in path by walking back from last vertex."""
+        path = self
+        while path._len:
+            if path._last == vertex:
+                return True
+            path = path._prefix
+        return False
+
+    def __add__(self, other_path):
+        """Concatenate paths, sharing this path as prefix of the result."""
+        path = self
+        for vertex in other_path:
+            path = path.extend(vertex)
+        return path
+
+    def __eq__(self, other_path):
+        """Paths are equal if they have the same vertices."""
+        if not isinstance(other_path, LinkedPath):
+            return NotImplemented
+        return (self is other_path or self._len == other_path._len and
+                self.vertices == other_path.vertices)
+
+    def __hash__(self):
+        """Hash of tuple of vertices."""
+        return hash(self.vertices)
+
+    @property
+    def vertices(self):
+        """Get vertices, built on first call."""
+        if self._vertices is None:
+            vertices = []
+            path = self
+            # stop at the nearest cell that has already been built
+            while path._vertices is None:
+                vertices.append(path._last)
+                path = path._prefix
+            vertices.reverse()
+            self._vertices = path._vertices + tuple(vertices)
+        return self._vertices
+
+    @property
+    def last(self):
+        """Get last vertex."""
+        return self._last
+
+    @property
+    def prefix(self):
+        """Get path without last vertex."""
+        return self._prefix
+
+    def extend(self, vertex):
+        """Get path with vertex added at end in constant time.
+
+        Parameters
+        ----------
+        vertex: Vertex
+            Vertex to add to end of path.
+
+        Returns
+        -------
+        path: LinkedPath
+            New path sharing this one as prefix.
+        """
+        path = LinkedPath.__new__(LinkedPath)
+        path._last, path._prefix, path._len = vertex, self, self._len + 1
+        path._vertices = None
+        return path
+
+    def topath(self):
+        """Get mutable copy of path.
+
+        Returns
+        -------
+        path: Path
+            Path with list of the same vertices.
+        """
+        return Path(list(self.vertices))
+
+
 class DirGraph:
     """Directed graph in adjacency list format.
 
@@ -129,6 +392,10 @@ class DirGraph:
     adj: dict, default None
         Adjacency dictionary. Keys are the vertices of the graph and values are
         lists of children
+    index: bool, default True
+        Whether to keep a hash index from vertex data to vertices, making
+        lookups with v constant time. Vertices with unhashable data are
+        found by a linear scan.
 
     Attributes
     ----------
@@ -136,18 +403,28 @@ class DirGraph:
         Keys are the vertices of the graph and values are lists of children
     vertices: list
         List of vertices of the graph, default empty
+    version: int
+        Number of changes made to the graph, for invalidating results
+        computed from it
     """
 
-    def __init__(self, adj={}):
+    def __init__(self, adj=None, index=True):
         """Class constructor."""
-        self._adj = adj
-        self._vertices = list(adj.keys())
+        self._adj = {} if adj is None else adj
+        self._index = {} if index else None
+        self._version = 0
+        self._build_radj()
+        self._build_index()
 
     def __str__(self):
         """Use node data for string representation."""
         return str({str(vertex): [str(child) for child in self.adj[vertex]]
                    for vertex in self.adj})
 
+    def __contains__(self, vertex):
+        """Check if vertex is in graph in constant time."""
+        return vertex in self.adj
+
     @property
     def adj(self):
         """Get, set, or delete adjacency dictionary."""
@@ -156,6 +433,9 @@ class DirGraph:
     @adj.setter
     def adj(self, new_adj):
         self._adj = new_adj
+        self._version += 1
+        self._build_radj()
+        self._build_index()
 
     @adj.deleter
     def adj(self):
@@ -163,12 +443,80 @@ class DirGraph:
 
     @property
     def vertices(self):
-        """Get set or delete vertices."""
+        """Get or delete vertices, stored as keys of adjacency dictionary."""
         return list(self.adj.keys())
 
     @vertices.deleter
     def vertices(self):
-        del self._vertices
+        del self.adj
+
+    @property
+    def version(self):
+        """Get number of changes made to graph."""
+        return self._version
+
+    def _build_radj(self):
+        """Build reverse adjacency index from adjacency dictionary.
+
+        Keys are the vertices of the graph and values are dicts whose keys
+        are the parents of the vertex and values the number of edges from
+        that parent. Parents are kept in the order of their first edge.
+        """
+        self._radj = {vertex: {} for vertex in self._adj}
+        for parent, children in self._adj.items():
+            for child in children:
+                parents = self._radj.setdefault(child, {})
+                parents[parent] = parents.get(parent, 0) + 1
+
+    def _build_index(self):
+        """Build hash index from vertex data to vertices, if enabled."""
+        if self._index is None:
+            return
+        self._index = {}
+        # vertices whose data is unhashable
+        self._unindexed = []
+        for vertex in self.vertices:
+            self._index_vertex(vertex)
+
+    def _index_vertex(self, vertex):
+        """Add vertex to data index.
+
+        Data held by a single vertex maps to the vertex itself, and only
+        data shared by several vertices maps to a list of them.
+        """
+        vertex._watch(self)
+        try:
+            bucket = self._index.setdefault(vertex.data, vertex)
+        except TypeError:
+            self._unindexed.append(vertex)
+            return
+        if isinstance(bucket, list):
+            bucket.append(vertex)
+        elif bucket is not vertex:
+            self._index[vertex.data] = [bucket, vertex]
+
+    def _unindex_vertex(self, vertex, data):
+        """Remove vertex stored under data from data index."""
+        try:
+            bucket = self._index[data]
+        except TypeError:
+            self._unindexed.remove(vertex)
+            return
+        if isinstance(bucket, list):
+            bucket.remove(vertex)
+            if len(bucket) == 1:
+                self._index[data] = bucket[0]
+        else:
+            del self._index[data]
+
+    def _reindex_vertex(self, vertex, old):
+        """Move vertex in data index after its data changed from old."""
+        if self._index is None or vertex not in self:
+            return
+        if old is not _MISSING:
+            self._unindex_vertex(vertex, old)
+        if hasattr(vertex, '_data'):
+            self._index_vertex(vertex)
 
     def v(self, data):
         """Find vertices by data.
@@ -178,16 +526,33 @@ class DirGraph:
         data: Object
             data located at desired vertex.
 
+        Raises
+        ------
+        ValueError
+            No vertex with data in graph
+
         Returns
         -------
         vertex: Vertex or list of Vertexs
-            Vertex or Vertices with data or None if none found.
+            Vertex or Vertices with data.
         """
-        # add all vertices with data to list
-        vertices = []
-        for vertex in self.vertices:
-            if vertex.data == data:
-                vertices += [vertex]
+        if self._index is None:
+            # add all vertices with data to list
+            vertices = []
+            for vertex in self.vertices:
+                if vertex.data == data:
+                    vertices += [vertex]
+        else:
+            try:
+                bucket = self._index.get(data, [])
+            except TypeError:
+                bucket = []
+            if isinstance(bucket, list):
+                vertices = list(bucket)
+            else:
+                vertices = [bucket]
+            vertices += [vertex for vertex in self._unindexed
+                         if vertex.data == data]
         if len(vertices) == 0:
             raise ValueError(f'Vertex with data {data} not in graph')
         elif len(vertices) == 1:
@@ -208,6 +573,10 @@ class DirGraph:
             raise ValueError('Duplicate vertex')
         else:
             self.adj[vertex] = []
+            self._radj[vertex] = {}
+            self._version += 1
+            if self._index is not None:
+                self._index_vertex(vertex)
 
     def addedge(self, parent, child):
         """Add edge to graph.
@@ -220,12 +589,155 @@ class DirGraph:
             Node edge ends at.
         """
         # check if parent and child vertices are in graph
-        if parent not in self.vertices:
+        if parent not in self.adj:
             raise ValueError('Parent vertex not in graph')
-        if child not in self.vertices:
+        if child not in self.adj:
             raise ValueError('Child vertex not in graph')
+        self._link(parent, child)
+
+    def _link(self, parent, child):
+        """Add edge between vertices already in graph without checks."""
         # add child to list for parent vertex in adj dict
         self.adj[parent].append(child)
+        self._version += 1
+        # count edge in reverse index
+        parents = self._radj[child]
+        parents[parent] = parents.get(parent, 0) + 1
+
+    def _check_edges(self, edges):
+        """Check all edges have both vertices in graph.
+
+        Parameters
+        ----------
+        edges: iterable
+            Iterable of (parent, child) pairs.
+
+        Returns
+        -------
+        edges: list
+            List of (parent, child) pairs.
+        """
+        edges = [(parent, child) for parent, child in edges]
+        for parent, child in edges:
+            if parent not in self.adj:
+                raise ValueError('Parent vertex not in graph')
+            if child not in self.adj:
+                raise ValueError('Child vertex not in graph')
+        return edges
+
+    def add_edges(self, edges, dedup=False):
+        """Add many edges to graph.
+
+        All edges are checked before any are added, so the graph is left
+        unchanged if one of them is invalid.
+
+        Parameters
+        ----------
+        edges: iterable
+            Iterable of (parent, child) pairs of vertices already in graph,
+            for example a list of tuples or a two column array.
+        dedup: bool, default False
+            Whether to skip edges already in the graph or repeated in edges.
+        """
+        for parent, child in self._check_edges(edges):
+            if dedup and parent in self._radj[child]:
+                continue
+            self._link(parent, child)
+
+    @classmethod
+    def from_edges(cls, edges, vertices=None, dedup=False):
+        """Build graph from edge list.
+
+        Parameters
+        ----------
+        edges: iterable
+            Iterable of (parent, child) pairs of vertices, or edges in any
+            form accepted by add_edges.
+        vertices: iterable, default None
+            Vertices of the graph. By default the vertices appearing in
+            edges, in order of first appearance.
+        dedup: bool, default False
+            Whether to skip repeated edges.
+
+        Returns
+        -------
+        graph: DirGraph
+            Graph with given vertices and edges.
+        """
+        edges = [tuple(edge) for edge in edges]
+        if vertices is None:
+            vertices = dict.fromkeys(vertex for edge in edges
+                                     for vertex in edge[:2])
+        graph = cls({vertex: [] for vertex in vertices})
+        graph.add_edges(edges, dedup=dedup)
+        return graph
+
+    def removeedge(self, parent, child):
+        """Remove edge from graph.
+
+        Takes time proportional to the out-degree of parent.
+
+        Parameters
+        ----------
+        parent: Node
+            Node edge starts from.
+        child: Node
+            Node edge ends at.
+
+        Raises
+        ------
+        ValueError
+            No edge from parent to child
+        """
+        if child not in self.adj or parent not in self._radj[child]:
+            raise ValueError('Edge not in graph')
+        self._unlink(parent, child)
+
+    def _unlink(self, parent, child):
+        """Remove first edge from parent to child without checks.
+
+        Returns
+        -------
+        i: int
+            Position of child in children of parent before removal.
+        """
+        i = self.adj[parent].index(child)
+        del self.adj[parent][i]
+        parents = self._radj[child]
+        parents[parent] -= 1
+        if not parents[parent]:
+            del parents[parent]
+        self._version += 1
+        return i
+
+    def removevertex(self, vertex):
+        """Remove vertex and all edges to and from it from graph.
+
+        Takes time proportional to the degree of vertex and the out-degrees
+        of its parents.
+
+        Parameters
+        ----------
+        vertex: Vertex
+            Vertex to remove.
+
+        Raises
+        ------
+        ValueError
+            Vertex not in graph
+        """
+        if vertex not in self.adj:
+            raise ValueError('Vertex not in graph')
+        for parent, count in list(self._radj[vertex].items()):
+            for _ in range(count):
+                self._unlink(parent, vertex)
+        for child in self.adj[vertex]:
+            self._radj[child].pop(vertex, None)
+        del self.adj[vertex]
+        del self._radj[vertex]
+        if self._index is not None and hasattr(vertex, '_data'):
+            self._unindex_vertex(vertex, vertex.data)
+        self._version += 1
 
     def children(self, vertex):
         """Get all children of vertex.
@@ -241,7 +753,7 @@ class DirGraph:
             List of children of vertex, possibly empty
         """
         # check if vertex is in graph
-        if vertex not in self.vertices:
+        if vertex not in self.adj:
             raise ValueError('Vertex not in graph')
         # return vertices children
         children = self.adj[vertex]
@@ -250,6 +762,10 @@ class DirGraph:
     def parents(self, vertex):
         """Get all parents of vertex.
 
+        Uses the reverse adjacency index, so takes time proportional to the
+        in-degree of vertex. The index is only kept up to date by the graph
+        methods, so the adjacency lists should not be edited directly.
+
         Parameters
         ----------
         vertex: Vertex
@@ -257,19 +773,14 @@ class DirGraph:
 
         Returns
         -------
-        children: list
-            List of children of vertex, possibly empty
+        parents: list
+            List of parents of vertex, possibly empty, in order of their
+            first edge to vertex
         """
         # check if vertex is in graph
-        if vertex not in self.vertices:
+        if vertex not in self.adj:
             raise ValueError('Vertex not in graph')
-        parents = []
-        # iterate over all other vertices
-        for other_vertex in self.vertices:
-            # if vertex is a child, other vertex is a parent
-            if vertex in self.children(other_vertex):
-                parents += [other_vertex]
-        return parents
+        return list(self._radj[vertex])
 
 
 class Graph(DirGraph):
@@ -290,17 +801,545 @@ class Graph(DirGraph):
         DirGraph.addedge(self, parent, child)
         DirGraph.addedge(self, child, parent)
 
+    def removeedge(self, parent, child):
+        """Override parent class method.
+
+        The edge is removed in both directions.
+
+        Parameters
+        ----------
+        parent: Node
+            Node edge starts from.
+        child: Node
+            Node edge ends at.
+        """
+        DirGraph.removeedge(self, parent, child)
+        DirGraph.removeedge(self, child, parent)
+
+    def add_edges(self, edges, dedup=False):
+        """Override parent class method.
+
+        Edges are checked once and then added in both directions in a
+        single pass.
+
+        Parameters
+        ----------
+        edges: iterable
+            Iterable of (parent, child) pairs of vertices already in graph.
+        dedup: bool, default False
+            Whether to skip edges already in the graph or repeated in edges.
+        """
+        for parent, child in self._check_edges(edges):
+            if dedup and parent in self._radj[child]:
+                continue
+            self._link(parent, child)
+            self._link(child, parent)
+
 
 class WeightedDirGraph(DirGraph):
-    """Weighted directed graph in adjacency list format."""
-    # TO DO
-    pass
+    """Weighted directed graph in adjacency list format.
+
+    Edge weights are stored per vertex in a float array parallel to the list
+    of children in the adjacency dictionary.
+
+    Parameters
+    ----------
+    adj: dict, default None
+        Adjacency dictionary. Keys are the vertices of the graph and values are
+        lists of children
+    weights: dict, default None
+        Keys are the vertices of the graph and values are lists of weights of
+        the edges to the children in adj. By default every edge has weight 1.
+    index: bool, default True
+        Whether to keep a hash index from vertex data to vertices.
+
+    Attributes
+    ----------
+    adj: dict, default empty
+        Keys are the vertices of the graph and values are lists of children
+    weights: dict, default empty
+        Keys are the vertices of the graph and values are arrays of edge
+        weights, parallel to the lists of children
+    vertices: list
+        List of vertices of the graph, default empty
+    """
+
+    def __init__(self, adj=None, weights=None, index=True):
+        """Class constructor."""
+        DirGraph.__init__(self, adj, index)
+        self._build_weights(weights)
+
+    @DirGraph.adj.setter
+    def adj(self, new_adj):
+        DirGraph.adj.fset(self, new_adj)
+        self._build_weights()
+
+    @property
+    def weights(self):
+        """Get edge weights dictionary."""
+        return self._weights
+
+    def _build_weights(self, weights=None):
+        """Build edge weight arrays, default weight 1 for every edge."""
+        if weights is None:
+            weights = {}
+        self._weights = {}
+        for vertex, children in self.adj.items():
+            vertex_weights = array('d', weights.get(vertex,
+                                                    [1.0] * len(children)))
+            if len(vertex_weights) != len(children):
+                raise ValueError('Weights must be given for every child')
+            self._weights[vertex] = vertex_weights
+
+    def addvertex(self, vertex):
+        """Add vertex to graph.
+
+        Parameters
+        ----------
+        vertex: Vertex
+            Vertex to add to graph. Has no children by default
+        """
+        DirGraph.addvertex(self, vertex)
+        self._weights[vertex] = array('d')
+
+    def addedge(self, parent, child, weight=1.0):
+        """Add weighted edge to graph.
+
+        Parameters
+        ----------
+        parent: Node
+            Node edge starts from.
+        child: Node
+            Node edge ends at.
+        weight: float, default 1
+            Weight of edge.
+        """
+        self._check_edges([(parent, child, weight)])
+        self._link(parent, child, weight)
+
+    def _link(self, parent, child, weight=1.0):
+        """Add weighted edge between vertices in graph without checks."""
+        DirGraph._link(self, parent, child)
+        self._weights[parent].append(weight)
+
+    def _unlink(self, parent, child):
+        """Remove first weighted edge from parent to child without checks."""
+        i = DirGraph._unlink(self, parent, child)
+        del self._weights[parent][i]
+        return i
+
+    def removevertex(self, vertex):
+        """Remove vertex and all edges to and from it from graph.
+
+        Parameters
+        ----------
+        vertex: Vertex
+            Vertex to remove.
+        """
+        DirGraph.removevertex(self, vertex)
+        del self._weights[vertex]
+
+    def _check_edges(self, edges):
+        """Check all edges have both vertices in graph.
+
+        Parameters
+        ----------
+        edges: iterable
+            Iterable of (parent, child, weight) triples, or (parent, child)
+            pairs for edges of weight 1.
+
+        Returns
+        -------
+        edges: list
+            List of (parent, child, weight) triples.
+        """
+        edges = [(edge[0], edge[1], edge[2] if len(edge) > 2 else 1.0)
+                 for edge in edges]
+        DirGraph._check_edges(self, (edge[:2] for edge in edges))
+        return edges
+
+    def add_edges(self, edges, dedup=False):
+        """Add many weighted edges to graph.
+
+        All edges are checked before any are added, so the graph is left
+        unchanged if one of them is invalid.
+
+        Parameters
+        ----------
+        edges: iterable
+            Iterable of (parent, child, weight) triples, or (parent, child)
+            pairs for edges of weight 1, of vertices already in graph.
+        dedup: bool, default False
+            Whether to skip edges between vertices already joined by an
+            edge, whatever its weight.
+        """
+        for parent, child, weight in self._check_edges(edges):
+            if dedup and parent in self._radj[child]:
+                continue
+            self._link(parent, child, weight)
+
+    def weight(self, parent, child):
+        """Get weight of edge.
+
+        Parameters
+        ----------
+        parent: Node
+            Node edge starts from.
+        child: Node
+            Node edge ends at.
+
+        Raises
+        ------
+        ValueError
+            No edge from parent to child
+
+        Returns
+        -------
+        weight: float
+            Weight of first edge from parent to child.
+        """
+        if child not in self.adj or parent not in self._radj[child]:
+            raise ValueError('Edge not in graph')
+        return self._weights[parent][self.adj[parent].index(child)]
 
+    def weighted_children(self, vertex):
+        """Get all children of vertex with edge weights.
 
-class WeightedGraph(Graph):
+        Parameters
+        ----------
+        vertex: Vertex
+            Vertex to get children of
+
+        Returns
+        -------
+        children: list
+            List of (child, weight) pairs, possibly empty
+        """
+        return list(zip(self.children(vertex), self._weights[vertex]))
+
+
+class WeightedGraph(WeightedDirGraph, Graph):
     """Weighted undirected graph in adjacency list format."""
-    # TO DO
-    pass
+
+    def addedge(self, parent, child, weight=1.0):
+        """Override parent class method.
+
+        Each edge is added twice with the same weight, once in each
+        direction.
+
+        Parameters
+        ----------
+        parent: Node
+            Node edge starts from.
+        child: Node
+            Node edge ends at.
+        weight: float, default 1
+            Weight of edge.
+        """
+        WeightedDirGraph.addedge(self, parent, child, weight)
+        WeightedDirGraph.addedge(self, child, parent, weight)
+
+    def add_edges(self, edges, dedup=False):
+        """Override parent class method.
+
+        Edges are checked once and then added in both directions in a
+        single pass.
+
+        Parameters
+        ----------
+        edges: iterable
+            Iterable of (parent, child, weight) triples, or (parent, child)
+            pairs for edges of weight 1, of vertices already in graph.
+        dedup: bool, default False
+            Whether to skip edges between vertices already joined by an
+            edge, whatever its weight.
+        """
+        for parent, child, weight in self._check_edges(edges):
+            if dedup and parent in self._radj[child]:
+                continue
+            self._link(parent, child, weight)
+            self._link(child, parent, weight)
+
+
+class CSRGraph(DirGraph):
+    """Frozen directed graph in compressed sparse row format.
+
+    Vertices are numbered 0, ..., n - 1 by their position in the vertex list
+    and the children of vertex i are the ids targets[offsets[i]:offsets[i+1]].
+    Adjacency is held in two flat integer arrays instead of a dict of lists,
+    so a large graph takes a fraction of the memory of a DirGraph and can be
+    traversed by index. The graph cannot be modified after construction.
+
+    Parameters
+    ----------
+    vertices: list
+        List of vertices. The id of a vertex is its position in the list.
+    offsets: array
+        Integer array of length len(vertices) + 1. Children of vertex i are
+        stored in targets from offsets[i] up to offsets[i + 1].
+    targets: array
+        Integer array of child vertex ids.
+
+    Attributes
+    ----------
+    vertices: list
+        List of vertices of the graph, ordered by id.
+    ids: dict
+        Keys are the vertices of the graph and values are their ids.
+    offsets: array
+        Row offsets into targets.
+    targets: array
+        Child vertex ids, grouped by parent.
+    """
+
+    def __init__(self, vertices, offsets, targets):
+        """Class constructor."""
+        if len(offsets) != len(vertices) + 1:
+            raise ValueError('Offsets must have one entry per vertex plus one')
+        if offsets[-1] != len(targets):
+            raise ValueError('Last offset must equal number of targets')
+        self._vertex_list = list(vertices)
+        self._ids = {vertex: i for i, vertex in enumerate(self._vertex_list)}
+        self._offsets = offsets
+        self._targets = targets
+        # reverse arrays are built on first call to parents
+        self._roffsets = None
+        self._rtargets = None
+        # adjacency dictionary is built on first access to adj
+        self._adj_dict = None
+        self._index = {}
+        self._version = 0
+        self._build_index()
+
+    @classmethod
+    def from_dirgraph(cls, graph):
+        """Build from a directed graph in adjacency list format.
+
+        Parameters
+        ----------
+        graph: DirGraph
+            Graph to convert. Vertex ids follow the order of graph.vertices.
+
+        Returns
+        -------
+        csr: CSRGraph
+            Frozen copy of graph.
+        """
+        vertices = graph.vertices
+        ids = {vertex: i for i, vertex in enumerate(vertices)}
+        offsets = array('q', [0])
+        targets = array('q')
+        for vertex in vertices:
+            targets.extend(ids[child] for child in graph.children(vertex))
+            offsets.append(len(targets))
+        return cls(vertices, offsets, targets)
+
+    @classmethod
+    def from_edges(cls, edges, vertices=None):
+        """Build from an edge list of vertex ids.
+
+        Edges are bucketed by parent with a counting sort, so construction
+        is O(V + E) and children keep their order in the edge list.
+
+        Parameters
+        ----------
+        edges: iterable
+            Iterable of (parent id, child id) pairs of ints, for example a
+            list of tuples or a two column array.
+        vertices: list, default None
+            List of vertices. The id of a vertex is its position in the list.
+            By default vertices are created with their ids 0, ..., n - 1 as
+            data, where n is one more than the largest id in edges.
+
+        Returns
+        -------
+        csr: CSRGraph
+            Graph with the given vertices and edges.
+        """
+        sources, dests = array('q'), array('q')
+        for parent, child in edges:
+            sources.append(parent)
+            dests.append(child)
+        if vertices is None:
+            n = max(max(sources, default=-1), max(dests, default=-1)) + 1
+            vertices = [Vertex(i) for i in range(n)]
+        n = len(vertices)
+        for parent, child in zip(sources, dests):
+            if not 0 <= parent < n:
+                raise ValueError(f'Parent id {parent} out of range')
+            if not 0 <= child < n:
+                raise ValueError(f'Child id {child} out of range')
+        offsets, targets = _bucket(n, sources, dests)
+        return cls(vertices, offsets, targets)
+
+    def __str__(self):
+        """Use node data for string representation."""
+        vertex_list = self._vertex_list
+        return str({str(vertex): [str(vertex_list[j])
+                                  for j in self.children_ids(i)]
+                    for i, vertex in enumerate(vertex_list)})
+
+    def __contains__(self, vertex):
+        """Check if vertex is in graph in constant time."""
+        return vertex in self._ids
+
+    @property
+    def adj(self):
+        """Get adjacency dictionary, built once on first access."""
+        if self._adj_dict is None:
+            self._adj_dict = {vertex: self.children(vertex)
+                              for vertex in self._vertex_list}
+        return self._adj_dict
+
+    @property
+    def vertices(self):
+        """Get vertices ordered by id."""
+        return list(self._vertex_list)
+
+    @property
+    def ids(self):
+        """Get dictionary of vertex ids."""
+        return self._ids
+
+    @property
+    def offsets(self):
+        """Get row offsets array."""
+        return self._offsets
+
+    @property
+    def targets(self):
+        """Get child ids array."""
+        return self._targets
+
+    def addvertex(self, vertex):
+        """Override parent class method, graph is frozen."""
+        raise ValueError('CSRGraph is frozen')
+
+    def addedge(self, parent, child):
+        """Override parent class method, graph is frozen."""
+        raise ValueError('CSRGraph is frozen')
+
+    def add_edges(self, edges, dedup=False):
+        """Override parent class method, graph is frozen."""
+        raise ValueError('CSRGraph is frozen')
+
+    def removeedge(self, parent, child):
+        """Override parent class method, graph is frozen."""
+        raise ValueError('CSRGraph is frozen')
+
+    def removevertex(self, vertex):
+        """Override parent class method, graph is frozen."""
+        raise ValueError('CSRGraph is frozen')
+
+    def children_ids(self, i):
+        """Get ids of all children of vertex with id i.
+
+        Parameters
+        ----------
+        i: int
+            Id of vertex to get children of
+
+        Returns
+        -------
+        children: array
+            Ids of children of vertex, possibly empty
+        """
+        return self._targets[self._offsets[i]:self._offsets[i + 1]]
+
+    def parent_ids(self, i):
+        """Get ids of all parents of vertex with id i.
+
+        The reverse arrays are built with one O(V + E) pass on first call.
+
+        Parameters
+        ----------
+        i: int
+            Id of vertex to get parents of
+
+        Returns
+        -------
+        parents: array
+            Ids of parents of vertex, possibly empty
+        """
+        if self._roffsets is None:
+            sources = array('q')
+            for parent in range(len(self._vertex_list)):
+                sources.extend([parent] * (self._offsets[parent + 1] -
+                                           self._offsets[parent]))
+            self._roffsets, self._rtargets = _bucket(
+                len(self._vertex_list), array('q', self._targets), sources)
+        return self._rtargets[self._roffsets[i]:self._roffsets[i + 1]]
+
+    def children(self, vertex):
+        """Get all children of vertex.
+
+        Parameters
+        ----------
+        vertex: Vertex
+            Vertex to get children of
+
+        Returns
+        -------
+        children: list
+            List of children of vertex, possibly empty
+        """
+        if vertex not in self._ids:
+            raise ValueError('Vertex not in graph')
+        return [self._vertex_list[j]
+                for j in self.children_ids(self._ids[vertex])]
+
+    def parents(self, vertex):
+        """Get all parents of vertex.
+
+        Parameters
+        ----------
+        vertex: Vertex
+            Vertex to get parents of
+
+        Returns
+        -------
+        parents: list
+            List of parents of vertex, possibly empty
+        """
+        if vertex not in self._ids:
+            raise ValueError('Vertex not in graph')
+        parents = []
+        # keep each parent once, as for DirGraph
+        for j in self.parent_ids(self._ids[vertex]):
+            if not parents or parents[-1] is not self._vertex_list[j]:
+                parents += [self._vertex_list[j]]
+        return parents
+
+
+def _bucket(n, sources, dests):
+    """Group dests by source with a stable counting sort.
+
+    Parameters
+    ----------
+    n: int
+        Number of vertices
+    sources: array
+        Source id of each edge
+    dests: array
+        Destination id of each edge
+
+    Returns
+    -------
+    offsets, targets: array, array
+        Compressed sparse row arrays.
+    """
+    offsets = array('q', bytes(8 * (n + 1)))
+    for source in sources:
+        offsets[source + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    targets = array('q', bytes(8 * len(dests)))
+    fill = offsets[:-1]
+    for source, dest in zip(sources, dests):
+        targets[fill[source]] = dest
+        fill[source] += 1
+    return offsets, targets
+
 
 if __name__ == '__main__':
     """Graph of vertices with city names as data and no edges."""
@@ -0,0 +1,226 @@
+"""Reading and writing graphs to disk.
+
+Two formats are supported. Text edge lists have one edge per line, given as
+the labels of the parent and child vertices separated by a delimiter, and are
+read in chunks so the whole file is never held in memory. The binary format
+stores the compressed sparse row arrays of a CSRGraph as raw 64-bit integers
+after a fixed size header, followed by the vertex labels:
+
+    header      magic b'CSRG', version, n vertices, m edges, little-endian
+    offsets     n + 1 int64
+    targets     m int64
+    label ends  n + 1 int64, byte offsets of labels in label blob
+    label blob  UTF-8 encoded vertex labels
+
+Opening a binary file maps it into memory and uses the arrays in place, so
+only the vertex labels are decoded.
+"""
+
+import csv
+import mmap
+import struct
+import sys
+from array import array
+from itertools import islice
+
+from structures.graph import Vertex, DirGraph, CSRGraph
+
+MAGIC = b'CSRG'
+VERSION = 1
+HEADER = struct.Struct('<4sIQQ')
+
+
+def read_edges(path, delimiter='\t', chunksize=65536):
+    """Stream edges from a text edge list in chunks.
+
+    Blank rows and rows whose first field starts with an unquoted '#' are
+    skipped. Quoted labels may contain delimiters and line breaks. Extra
+    columns after the parent and child labels are ignored.
+
+    Parameters
+    ----------
+    path: str
+        Path of edge list file.
+    delimiter: str, default tab
+        Column delimiter, for example ',' for CSV files.
+    chunksize: int, default 65536
+        Maximum number of edges in each chunk.
+
+    Yields
+    ------
+    chunk: list
+        List of (parent label, child label) pairs of strings.
+
+    Raises
+    ------
+    ValueError
+        Row with fewer than two columns
+    """
+    with open(path, newline='') as f:
+        edges = _read_rows(f, delimiter, path)
+        while True:
+            chunk = list(islice(edges, chunksize))
+            if not chunk:
+                return
+            yield chunk
+
+
+def _read_rows(f, delimiter, path):
+    """Generate (parent, child) pairs from rows of an open edge list."""
+    # raw lines of the record being parsed, to tell quoted fields apart
+    record = []
+    line_num = 0
+
+    def lines():
+        for line in f:
+            record.append(line)
+            yield line
+
+    for row in csv.reader(lines(), delimiter=delimiter):
+        first, start = record[0], line_num + 1
+        line_num += len(record)
+        record.clear()
+        if not first.strip() or first.startswith('#'):
+            continue
+        if len(row) < 2:
+            raise ValueError(f'{path}, line {start}: expected at least two '
+                             'columns')
+        yield row[0], row[1]
+
+
+def load_edges(path, delimiter='\t', chunksize=65536, graph_class=DirGraph):
+    """Build graph from a text edge list.
+
+    One vertex is created for each distinct label, with the label as data.
+
+    Parameters
+    ----------
+    path: str
+        Path of edge list file.
+    delimiter: str, default tab
+        Column delimiter, for example ',' for CSV files.
+    chunksize: int, default 65536
+        Number of edges to read and add at a time.
+    graph_class: class, default DirGraph
+        Class of graph to build, for example Graph for undirected edges.
+
+    Returns
+    -------
+    graph: DirGraph
+        Graph with vertices and edges from file.
+    """
+    graph = graph_class()
+    vertices = {}
+    for chunk in read_edges(path, delimiter, chunksize):
+        for edge in chunk:
+            for label in edge:
+                if label not in vertices:
+                    vertices[label] = Vertex(label)
+                    graph.addvertex(vertices[label])
+        graph.add_edges((vertices[parent], vertices[child])
+                        for parent, child in chunk)
+    return graph
+
+
+def write_edges(graph, path, delimiter='\t'):
+    """Write graph to a text edge list.
+
+    Vertices are written as their string representation, so vertices
+    without edges are not saved. Lines that read_edges would skip as
+    comments or blank lines are written with quoted labels.
+
+    Parameters
+    ----------
+    graph: DirGraph
+        Graph to write.
+    path: str
+        Path of edge list file.
+    delimiter: str, default tab
+        Column delimiter.
+    """
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f, delimiter=delimiter, lineterminator='\n')
+        quoted_writer = csv.writer(f, delimiter=delimiter,
+                                   lineterminator='\n',
+                                   quoting=csv.QUOTE_ALL)
+        for vertex in graph.vertices:
+            parent = str(vertex)
+            for child in graph.children(vertex):
+                row = (parent, str(child))
+                if parent.startswith('#') or not ''.join(row).strip():
+                    quoted_writer.writerow(row)
+                else:
+                    writer.writerow(row)
+
+
+def write_csr(graph, path):
+    """Write graph to binary compressed sparse row file.
+
+    Parameters
+    ----------
+    graph: DirGraph
+        Graph to write. Graphs other than a CSRGraph are converted first.
+    path: str
+        Path of binary file.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_dirgraph(graph)
+    labels = [str(vertex).encode() for vertex in graph.vertices]
+    label_ends = array('q', [0])
+    for label in labels:
+        label_ends.append(label_ends[-1] + len(label))
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(labels), len(graph.targets)))
+        for values in (graph.offsets, graph.targets, label_ends):
+            values = array('q', values)
+            if sys.byteorder == 'big':
+                values.byteswap()
+            f.write(values.tobytes())
+        f.write(b''.join(labels))
+
+
+def open_csr(path, graph_class=CSRGraph):
+    """Open binary compressed sparse row file without reading the edges.
+
+    The file is memory-mapped read-only and the offsets and targets arrays of
+    the returned graph are views into the mapping, so pages are only loaded
+    as they are traversed. Vertices are created with their labels as data.
+
+    Parameters
+    ----------
+    path: str
+        Path of binary file.
+    graph_class: class, default CSRGraph
+        Class of graph to return, for example CSRGraphProcess to run graph
+        processing algorithms on it.
+
+    Raises
+    ------
+    ValueError
+        File is not a compressed sparse row file
+
+    Returns
+    -------
+    graph: CSRGraph
+        Frozen graph backed by file.
+    """
+    with open(path, 'rb') as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, n, m = HEADER.unpack_from(buf)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'{path} is not a CSR graph file')
+    view = memoryview(buf)
+    start = HEADER.size
+    arrays = []
+    for length in (n + 1, m, n + 1):
+        values = view[start:start + 8 * length].cast('q')
+        if sys.byteorder == 'big':
+            values = array('q', values)
+            values.byteswap()
+        arrays.append(values)
+        start += 8 * length
+    offsets, targets, label_ends = arrays
+    blob = view[start:]
+    vertices = [Vertex(str(blob[label_ends[i]:label_ends[i + 1]], 'utf-8'))
+                for i in range(n)]
+    return graph_class(vertices, offsets, targets)
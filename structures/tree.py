@@ -1,8 +1,59 @@
 """Tree data structures."""
 
+from array import array
+
 from structures.linkedlist import DoubleNode
 
 
+class TreeNode(DoubleNode):
+    """
+    Double node with the height and size of the subtree below it.
+
+    Parameters
+    ----------
+    data : obj, default None
+        The data to be stored in the node. Can be any object.
+
+    Attributes
+    ----------
+    data : obj
+        Object stored in the node.
+    left : TreeNode
+        Left-hand node,
+    right: TreeNode
+        Right-hand node,
+    height: int
+        Number of nodes on longest path down from node, 1 for a leaf.
+    size: int
+        Number of nodes at or below node, 1 for a leaf.
+
+    """
+
+    def __init__(self, data=None, left=None, right=None):
+        """Class constructor."""
+        DoubleNode.__init__(self, data, left, right)
+        self._height = 1
+        self._size = 1
+
+    @property
+    def height(self):
+        """Get or set subtree height."""
+        return self._height
+
+    @height.setter
+    def height(self, val):
+        self._height = val
+
+    @property
+    def size(self):
+        """Get or set subtree size."""
+        return self._size
+
+    @size.setter
+    def size(self, val):
+        self._size = val
+
+
 class BinarySearchTree:
     """
     Double node implementation of binary search tree.
@@ -22,25 +73,72 @@ class BinarySearchTree:
         comparison methods:
 
         https://docs.python.org/3/reference/datamodel.html
+    balance : str, default None
+        Balancing scheme. With None the tree is a plain binary search tree,
+        whose shape depends on insertion order and which degenerates into a
+        list on sorted input. With 'avl' the tree is an AVL tree: after each
+        insert or delete, rotations restore the heights of the two subtrees
+        of every node to within one of each other, so the tree has height
+        O(log n) and all operations take O(log n) time.
+
+        https://en.wikipedia.org/wiki/AVL_tree
 
     Attributes
     ----------
-    root : DoubleNode
+    root : TreeNode
         Root node.
+    balance : str
+        Balancing scheme.
 
     """
 
-    def __init__(self, data=None):
+    BALANCE_SCHEMES = (None, 'avl')
+
+    def __init__(self, data=None, balance=None):
         """Class constructor."""
+        if balance not in self.BALANCE_SCHEMES:
+            raise ValueError(f'Unknown balancing scheme {balance}')
+        self._balance = balance
         if hasattr(data, '__iter__'):
             # data iterable
             data_iter = iter(data)
             # set root node and current node as first node
-            self._root = DoubleNode(next(data_iter))
+            self._root = TreeNode(next(data_iter, None))
             # iteratively build tree
             self.insert(self.root, data_iter)
         else:
-            self._root = DoubleNode(data=data)
+            self._root = TreeNode(data=data)
+
+    @classmethod
+    def from_sorted(cls, data, balance=None, sort=False):
+        """
+        Build perfectly balanced tree from sorted values.
+
+        Each subtree is rooted at the middle value of its range, so
+        building takes O(n) time with no comparisons, and the tree has
+        the smallest possible height. It is a valid AVL tree, so any
+        balance can be used.
+
+        Parameters
+        ----------
+        data: iterable
+            Values in sorted order.
+        balance : str, default None
+            Balancing scheme used by later inserts and deletes.
+        sort: bool, default False
+            Sort values first if True, in O(n log n) time.
+
+        Returns
+        -------
+        bst: BinarySearchTree
+            Tree containing values.
+
+        """
+        values = sorted(data) if sort else list(data)
+        bst = cls(balance=balance)
+        if values:
+            bst.root = _build_balanced(values, 0, len(values))
+        return bst
 
     @property
     def root(self):
@@ -55,49 +153,68 @@ class BinarySearchTree:
     def root(self):
         del self._root
 
+    @property
+    def balance(self):
+        """Get balancing scheme."""
+        return self._balance
+
     def insert(self, node, data):
         """
         Insert data in tree starting at node.
 
+        Insertion always starts at the root, so that the subtree heights
+        and sizes of all nodes above the new node are updated, and in a
+        balanced tree they are rebalanced on the way back up.
+
         Parameters
         ----------
-        node: DoubleNode
-            Node to insert data under
+        node: TreeNode
+            Node in tree, unused since insertion starts at the root
         data : non-iterable object or iterable.
             Data to insert
 
         """
-        # if data is an iterable
-        if hasattr(data, '__iter__'):
-            for elt in data: 
-                # if elt belongs to the left of node
-                if elt <= node.data:
-                    # if left pointer is nonnull recurse
-                    if node.left:
-                        self.insert(node.left, elt)
-                    # if left pointer is null create a node
-                    else:
-                        node.left = DoubleNode(elt)
-                # if elt belongs to the right of node
-                else:
-                    # if right pointer is nonnull recurse
-                    if node.right:
-                        self.insert(node.right, elt)
-                    # if right pointer is null create a node
-                    else:
-                        node.right = DoubleNode(elt)
-        # if data is not an iterable
-        else:
-            if data <= node.data:
-                if node.left:
-                    self.insert(node.left, data)
-                else:
-                    node.left = DoubleNode(data)
-            else:
-                if node.right:
-                    self.insert(node.right, data)
-                else:
-                    node.right = DoubleNode(data)
+        if not hasattr(data, '__iter__'):
+            data = [data]
+        for elt in data:
+            self._insert(elt)
+
+    def inorder(self, node=None):
+        """
+        Iterate over values at or below node in order.
+
+        Uses an explicit stack instead of recursion, so memory use is
+        proportional to the depth of the tree and values are yielded as
+        the traversal reaches them.
+
+        Parameters
+        ----------
+        node: TreeNode, default None
+            Node to begin traversal from, the root if None.
+
+        Yields
+        ------
+        data: object
+            Values in sorted order.
+
+        """
+        if node is None:
+            node = self.root
+        if node.data is None:
+            return
+        stack = []
+        while stack or node:
+            # walk left as far as possible, saving nodes to visit later
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.data
+            node = node.right
+
+    def __iter__(self):
+        """Iterate over values in order."""
+        return self.inorder()
 
     def inorder_traversal(self, node):
         """
@@ -105,7 +222,7 @@ class BinarySearchTree:
 
         Parameters
         ----------
-        node: DoubleNode
+        node: TreeNode
             Node to begin traveral from.
 
 
@@ -115,31 +232,7 @@ class BinarySearchTree:
             Sorted list of values.
 
         """
-        data = []
-        # recurse on non-empty left node
-        if node.left:
-            left_res = self.inorder_traversal(node.left)
-            # flatten nested list
-            for item in left_res:
-                if isinstance(item, list):
-                    for elt in item:
-                        data += [elt]
-                else:
-                    data += [item]
-        # include data if node is non-empty
-        if node.data:
-            data += [node.data]
-        # recurse on non-empty right node
-        if node.right:
-            right_res = self.inorder_traversal(node.right)
-            # flatten nested list
-            for item in right_res:
-                if isinstance(item, list):
-                    for elt in item:
-                        data += [elt]
-                else:
-                    data += [item]
-        return data
+        return list(self.inorder(node))
 
     def search(self, node, data):
         """
@@ -149,7 +242,7 @@ class BinarySearchTree:
         ----------
         data: object
             Value to search for. Should support rich comparison.
-        node: DoubleNode
+        node: TreeNode
             Node to begin search from.
 
         Raises
@@ -160,34 +253,18 @@ class BinarySearchTree:
 
         Returns
         -------
-        result: DoubleNode
+        result: TreeNode
             Node in tree containing data if found.
 
         """
         # Raise error if tree is empty
-        if not node.data:
+        if node.data is None:
             raise ValueError("Tree is empty")
-        # Base case: return node if data is found
-        elif node.data == data:
-            result = node
-            return result
-        else:
-            # If data is left of node
-            if data <= node.data:
-                # Recurse if left node is non-empty
-                if node.left:
-                    result = self.search(node.left, data)
-                    return result
-                else:
-                    raise ValueError(f"{data} not found")
-            # If data is right of node
-            else:
-                if node.right:
-                    # Recurse if right node is non-empty
-                    result = self.search(node.right, data)
-                    return result
-                else:
-                    raise ValueError(f"{data} not found")
+        while node:
+            if node.data == data:
+                return node
+            node = node.left if data <= node.data else node.right
+        raise ValueError(f"{data} not found")
 
     def min_val(self, node):
         """
@@ -195,7 +272,7 @@ class BinarySearchTree:
 
         Parameters
         ----------
-        node: DoubleNode
+        node: TreeNode
             Node to begin searching from
 
         Raises
@@ -209,7 +286,7 @@ class BinarySearchTree:
             Minimum value found at or below node
 
         """
-        if not node.data:
+        if node.data is None:
             raise ValueError('Node is empty')
         # Move left until reaching a null pointer
         while True:
@@ -225,7 +302,7 @@ class BinarySearchTree:
 
         Parameters
         ----------
-        node: DoubleNode
+        node: TreeNode
             Node to begin searching from
 
         Raises
@@ -239,7 +316,7 @@ class BinarySearchTree:
             Maximum value found at or below node
 
         """
-        if not node.data:
+        if node.data is None:
             raise ValueError('Node is empty')
         # Move left until reaching a null pointer
         while True:
@@ -253,6 +330,12 @@ class BinarySearchTree:
         """
         Delete node containing data.
 
+        A node with two children takes the maximum value of its left
+        subtree, whose node is removed instead. The search always starts at
+        the root, so that the heights and sizes of the parents of the
+        removed node can be updated, and in a balanced tree they are
+        rebalanced on the way back up.
+
         Parameters
         ----------
         data: object
@@ -260,50 +343,810 @@ class BinarySearchTree:
             tree and support rich comparison methods:
 
             https://docs.python.org/3/reference/datamodel.html
-        node: DoubleNode
-            Node to begin search from
+        node: TreeNode
+            Node in tree, unused since the search starts at the root
 
         Raises
         ------
         ValueError
+            Tree is empty
             data not found
 
         """
-        # find node containing data if it exists
-        del_node = self.search(node, data)
-        # node is a leaf
-        if not del_node.left and not del_node.right:
-            del_node = None
-        # node has one right child
-        elif not del_node.left and del_node.right:
-            # copy right child data and children to node
-            del_node.data = del_node.right.data
-            temp_left = del_node.left.left
-            temp_right = del_node.left.right
-            del_node.left = temp_left
-            del_node.right = temp_right
-            # del right child
-            del_node.right = None
-        # node has one left child
-        elif del_node.left and not del_node.right:
-            # copy left child data and children to node
-            del_node.data = del_node.left.data
-            temp_left = del_node.left.left
-            temp_right = del_node.left.right
-            del_node.left = temp_left
-            del_node.right = temp_right
-            # del left childdel_
-            del_node.left = None
-        # node has two children
+        node = self.root
+        if node.data is None:
+            raise ValueError("Tree is empty")
+        # find node containing data, recording the path down to it
+        path = []
+        while node and node.data != data:
+            path.append(node)
+            node = node.left if data <= node.data else node.right
+        if not node:
+            raise ValueError(f"{data} not found")
+        if node.left and node.right:
+            # find node with max value of left subtree
+            path.append(node)
+            max_node = node.left
+            while max_node.right:
+                path.append(max_node)
+                max_node = max_node.right
+            node.data = max_node.data
+            node = max_node
+        # node now has at most one child, which takes its place
+        child = node.left or node.right
+        if not path:
+            if child:
+                self.root = child
+            else:
+                # deleting only node leaves an empty tree
+                node.data = None
+        elif path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        if self.balance:
+            self._rebalance(path)
+        else:
+            for node in reversed(path):
+                _update(node)
+
+    def __len__(self):
+        """Number of values in tree."""
+        return 0 if self.root.data is None else self.root.size
+
+    def select(self, k):
+        """
+        Find k-th smallest value.
+
+        Uses the subtree sizes to descend straight to the value, in time
+        proportional to the height of the tree.
+
+        Parameters
+        ----------
+        k: int
+            Position of value in sorted order, starting from 0.
+
+        Raises
+        ------
+        ValueError
+            k out of range
+
+        Returns
+        -------
+        data: object
+            Value with k values before it in sorted order.
+
+        """
+        if not 0 <= k < len(self):
+            raise ValueError(f"{k} out of range")
+        node = self.root
+        while True:
+            left_size = _size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k == left_size:
+                return node.data
+            else:
+                k -= left_size + 1
+                node = node.right
+
+    def rank(self, data):
+        """
+        Count values less than data.
+
+        Parameters
+        ----------
+        data: object
+            Value to rank, which need not be in the tree.
+
+        Returns
+        -------
+        rank: int
+            Number of values in tree less than data, which is the position
+            of data in sorted order if it is in the tree.
+
+        """
+        rank = 0
+        node = self.root if self.root.data is not None else None
+        while node:
+            if data <= node.data:
+                node = node.left
+            else:
+                rank += _size(node.left) + 1
+                node = node.right
+        return rank
+
+    def range_values(self, lo, hi):
+        """
+        Iterate over values in half-open range in order.
+
+        Takes time proportional to the height of the tree plus the number
+        of values yielded.
+
+        Parameters
+        ----------
+        lo: object
+            Lower bound, included.
+        hi: object
+            Upper bound, excluded.
+
+        Yields
+        ------
+        data: object
+            Values v with lo <= v < hi in sorted order.
+
+        """
+        if self.root.data is None:
+            return
+        stack = []
+        node = self.root
+        # save nodes at or above lo on path down to lo
+        while node:
+            if lo <= node.data:
+                stack.append(node)
+                node = node.left
+            else:
+                node = node.right
+        while stack:
+            node = stack.pop()
+            if not node.data < hi:
+                return
+            yield node.data
+            node = node.right
+            while node:
+                stack.append(node)
+                node = node.left
+
+    def _insert(self, data):
+        """Insert single value, rebalancing if balanced."""
+        node = self.root
+        if node.data is None:
+            # empty tree
+            node.data = data
+            return
+        path = []
+        while node:
+            path.append(node)
+            node = node.left if data <= node.data else node.right
+        if data <= path[-1].data:
+            path[-1].left = TreeNode(data)
+        else:
+            path[-1].right = TreeNode(data)
+        if self.balance:
+            self._rebalance(path)
         else:
-            # search for max value node and its parent node
-            # in left subtree
-            curr = node.left
-            while curr.right:
-                prev = curr
-                curr = curr.right
-            max_val_left = curr.data
-            # copy max left value to node
-            del_node.data = max_val_left
-            # bypass max value node
-            prev.right = curr.left
+            for node in reversed(path):
+                _update(node)
+
+    def _rebalance(self, path):
+        """
+        Restore balance on path from root after an insert or delete.
+
+        Parameters
+        ----------
+        path: list
+            Nodes from the root down to the parent of the changed node.
+
+        """
+        for k in reversed(range(len(path))):
+            node = path[k]
+            new_node = _avl_balance(node)
+            if new_node is not node:
+                if k == 0:
+                    self.root = new_node
+                elif path[k - 1].left is node:
+                    path[k - 1].left = new_node
+                else:
+                    path[k - 1].right = new_node
+
+
+class NodeView:
+    """
+    View of node stored in an ArrayBinarySearchTree.
+
+    Views are created on demand by the tree and read its arrays, so they
+    stay valid while the tree changes, but a view of a deleted node may
+    later show another node stored in the same slot.
+
+    Parameters
+    ----------
+    tree : ArrayBinarySearchTree
+        Tree containing node.
+    index : int
+        Index of node in arrays of tree, 0 for no node.
+
+    Attributes
+    ----------
+    index : int
+        Index of node in arrays of tree.
+    data : obj
+        Object stored in the node, None for the root of an empty tree.
+    left : NodeView
+        Left-hand node, None if there is none.
+    right: NodeView
+        Right-hand node, None if there is none.
+    height: int
+        Number of nodes on longest path down from node, 1 for a leaf.
+    size: int
+        Number of nodes at or below node, 1 for a leaf.
+
+    """
+
+    __slots__ = ('_tree', '_index')
+
+    def __init__(self, tree, index):
+        """Class constructor."""
+        self._tree = tree
+        self._index = index
+
+    @property
+    def index(self):
+        """Get index of node."""
+        return self._index
+
+    @property
+    def data(self):
+        """Get data stored in node."""
+        return self._tree._keys[self._index] if self._index else None
+
+    @property
+    def left(self):
+        """Get left-hand node."""
+        return self._tree._view(self._tree._left[self._index])
+
+    @property
+    def right(self):
+        """Get right-hand node."""
+        return self._tree._view(self._tree._right[self._index])
+
+    @property
+    def height(self):
+        """Get subtree height."""
+        return self._tree._height[self._index]
+
+    @property
+    def size(self):
+        """Get subtree size."""
+        return self._tree._size[self._index]
+
+
+class ArrayBinarySearchTree(BinarySearchTree):
+    """
+    Binary search tree stored in parallel arrays.
+
+    Keys, child indices, subtree heights and subtree sizes are held in
+    typed arrays indexed by node, instead of one object per node. This
+    uses a fraction of the memory of BinarySearchTree and makes searches
+    faster, at the cost of only storing numbers. Index 0 is a sentinel
+    standing for no node, with height and size 0. Slots of deleted nodes
+    are kept on a free list, linked through their right child indices,
+    and reused by later inserts.
+
+    Methods taking a node accept a NodeView, such as the root, and return
+    NodeView objects in place of nodes.
+
+    Parameters
+    ----------
+    data : non-iterable object or iterable, default None.
+        Value or iterable of values to insert.
+    balance : str, default None
+        Balancing scheme, see BinarySearchTree.
+    typecode : str, default 'q'
+        Type code of key array, for example 'q' for 64-bit integers or 'd'
+        for floats:
+
+        https://docs.python.org/3/library/array.html
+
+    Attributes
+    ----------
+    root : NodeView
+        Root node.
+    balance : str
+        Balancing scheme.
+    typecode : str
+        Type code of key array.
+
+    """
+
+    def __init__(self, data=None, balance=None, typecode='q'):
+        """Class constructor."""
+        if balance not in self.BALANCE_SCHEMES:
+            raise ValueError(f'Unknown balancing scheme {balance}')
+        self._balance = balance
+        # slot 0 is the sentinel
+        self._keys = array(typecode, [0])
+        self._left = array('q', [0])
+        self._right = array('q', [0])
+        self._height = array('q', [0])
+        self._size = array('q', [0])
+        self._root_index = 0
+        self._free = 0
+        if data is not None:
+            self.insert(self.root, data)
+
+    @classmethod
+    def from_sorted(cls, data, balance=None, sort=False, typecode='q'):
+        """
+        Build perfectly balanced tree from sorted values.
+
+        Values are stored in sorted order, so the arrays are filled in
+        O(n) time with no comparisons.
+
+        Parameters
+        ----------
+        data: iterable
+            Values in sorted order.
+        balance : str, default None
+            Balancing scheme used by later inserts and deletes.
+        sort: bool, default False
+            Sort values first if True, in O(n log n) time.
+        typecode : str, default 'q'
+            Type code of key array.
+
+        Returns
+        -------
+        bst: ArrayBinarySearchTree
+            Tree containing values.
+
+        """
+        bst = cls(balance=balance, typecode=typecode)
+        bst._keys.extend(sorted(data) if sort else data)
+        zeros = bytes(8 * len(bst._keys))
+        for name in ('_left', '_right', '_height', '_size'):
+            setattr(bst, name, array('q', zeros))
+        bst._root_index = bst._build(1, len(bst._keys))
+        return bst
+
+    @property
+    def root(self):
+        """Get or set root node of tree."""
+        return NodeView(self, self._root_index)
+
+    @root.setter
+    def root(self, node):
+        self._root_index = node.index
+
+    @property
+    def typecode(self):
+        """Get type code of key array."""
+        return self._keys.typecode
+
+    def __len__(self):
+        """Number of values in tree."""
+        return self._size[self._root_index]
+
+    def inorder(self, node=None):
+        """
+        Iterate over values at or below node in order.
+
+        Parameters
+        ----------
+        node: NodeView, default None
+            Node to begin traversal from, the root if None.
+
+        Yields
+        ------
+        data: object
+            Values in sorted order.
+
+        """
+        keys, left, right = self._keys, self._left, self._right
+        i = self._root_index if node is None else node.index
+        stack = []
+        while stack or i:
+            while i:
+                stack.append(i)
+                i = left[i]
+            i = stack.pop()
+            yield keys[i]
+            i = right[i]
+
+    def search(self, node, data):
+        """
+        Search tree for data after node.
+
+        Parameters
+        ----------
+        data: object
+            Value to search for.
+        node: NodeView
+            Node to begin search from.
+
+        Raises
+        ------
+        ValueError
+            Tree is empty
+            data not found
+
+        Returns
+        -------
+        result: NodeView
+            Node in tree containing data if found.
+
+        """
+        keys, left, right = self._keys, self._left, self._right
+        i = node.index
+        if not i:
+            raise ValueError("Tree is empty")
+        while i:
+            key = keys[i]
+            if key == data:
+                return NodeView(self, i)
+            i = left[i] if data <= key else right[i]
+        raise ValueError(f"{data} not found")
+
+    def min_val(self, node):
+        """
+        Find minimum value at or below node.
+
+        Parameters
+        ----------
+        node: NodeView
+            Node to begin searching from
+
+        Raises
+        ------
+        ValueError
+            Empty node
+
+        Returns
+        -------
+        min_val: object
+            Minimum value found at or below node
+
+        """
+        return self._keys[self._extreme(node, self._left)]
+
+    def max_val(self, node):
+        """
+        Find maximum value at or below node.
+
+        Parameters
+        ----------
+        node: NodeView
+            Node to begin searching from
+
+        Raises
+        ------
+        ValueError
+            Empty node
+
+        Returns
+        -------
+        max_val: object
+            Maximum value found at or below node
+
+        """
+        return self._keys[self._extreme(node, self._right)]
+
+    def delete(self, node, data):
+        """
+        Delete node containing data and free its slot.
+
+        Parameters
+        ----------
+        data: object
+            Value to delete.
+        node: NodeView
+            Node in tree, unused since the search starts at the root
+
+        Raises
+        ------
+        ValueError
+            Tree is empty
+            data not found
+
+        """
+        keys, left, right = self._keys, self._left, self._right
+        i = self._root_index
+        if not i:
+            raise ValueError("Tree is empty")
+        path = []
+        while i and keys[i] != data:
+            path.append(i)
+            i = left[i] if data <= keys[i] else right[i]
+        if not i:
+            raise ValueError(f"{data} not found")
+        if left[i] and right[i]:
+            # move max value of left subtree up and remove its node
+            path.append(i)
+            j = left[i]
+            while right[j]:
+                path.append(j)
+                j = right[j]
+            keys[i] = keys[j]
+            i = j
+        child = left[i] or right[i]
+        if not path:
+            self._root_index = child
+        elif left[path[-1]] == i:
+            left[path[-1]] = child
+        else:
+            right[path[-1]] = child
+        # push slot onto free list
+        right[i] = self._free
+        self._free = i
+        if self.balance:
+            self._rebalance(path)
+        else:
+            for j in reversed(path):
+                self._update(j)
+
+    def select(self, k):
+        """
+        Find k-th smallest value.
+
+        Parameters
+        ----------
+        k: int
+            Position of value in sorted order, starting from 0.
+
+        Raises
+        ------
+        ValueError
+            k out of range
+
+        Returns
+        -------
+        data: object
+            Value with k values before it in sorted order.
+
+        """
+        if not 0 <= k < len(self):
+            raise ValueError(f"{k} out of range")
+        left, right, size = self._left, self._right, self._size
+        i = self._root_index
+        while True:
+            left_size = size[left[i]]
+            if k < left_size:
+                i = left[i]
+            elif k == left_size:
+                return self._keys[i]
+            else:
+                k -= left_size + 1
+                i = right[i]
+
+    def rank(self, data):
+        """
+        Count values less than data.
+
+        Parameters
+        ----------
+        data: object
+            Value to rank, which need not be in the tree.
+
+        Returns
+        -------
+        rank: int
+            Number of values in tree less than data.
+
+        """
+        keys, left, right = self._keys, self._left, self._right
+        size = self._size
+        rank = 0
+        i = self._root_index
+        while i:
+            if data <= keys[i]:
+                i = left[i]
+            else:
+                rank += size[left[i]] + 1
+                i = right[i]
+        return rank
+
+    def range_values(self, lo, hi):
+        """
+        Iterate over values in half-open range in order.
+
+        Parameters
+        ----------
+        lo: object
+            Lower bound, included.
+        hi: object
+            Upper bound, excluded.
+
+        Yields
+        ------
+        data: object
+            Values v with lo <= v < hi in sorted order.
+
+        """
+        keys, left, right = self._keys, self._left, self._right
+        stack = []
+        i = self._root_index
+        while i:
+            if lo <= keys[i]:
+                stack.append(i)
+                i = left[i]
+            else:
+                i = right[i]
+        while stack:
+            i = stack.pop()
+            if not keys[i] < hi:
+                return
+            yield keys[i]
+            i = right[i]
+            while i:
+                stack.append(i)
+                i = left[i]
+
+    def _view(self, i):
+        """View of node at index i, None for the sentinel."""
+        return NodeView(self, i) if i else None
+
+    def _extreme(self, node, children):
+        """Index of last node reached from node through children."""
+        i = node.index
+        if not i:
+            raise ValueError('Node is empty')
+        while children[i]:
+            i = children[i]
+        return i
+
+    def _new_node(self, data):
+        """Store data in a free or new slot and return its index."""
+        i = self._free
+        if i:
+            self._free = self._right[i]
+            self._keys[i] = data
+            self._left[i] = self._right[i] = 0
+            self._height[i] = self._size[i] = 1
+            return i
+        self._keys.append(data)
+        for values in (self._left, self._right):
+            values.append(0)
+        for values in (self._height, self._size):
+            values.append(1)
+        return len(self._keys) - 1
+
+    def _insert(self, data):
+        """Insert single value, rebalancing if balanced."""
+        keys, left, right = self._keys, self._left, self._right
+        i = self._root_index
+        if not i:
+            self._root_index = self._new_node(data)
+            return
+        path = []
+        while i:
+            path.append(i)
+            i = left[i] if data <= keys[i] else right[i]
+        i = self._new_node(data)
+        if data <= keys[path[-1]]:
+            left[path[-1]] = i
+        else:
+            right[path[-1]] = i
+        if self.balance:
+            self._rebalance(path)
+        else:
+            for j in reversed(path):
+                self._update(j)
+
+    def _build(self, start, stop):
+        """Link sorted slots start to stop - 1 into balanced subtree."""
+        if start == stop:
+            return 0
+        mid = (start + stop) // 2
+        self._left[mid] = self._build(start, mid)
+        self._right[mid] = self._build(mid + 1, stop)
+        self._update(mid)
+        return mid
+
+    def _rebalance(self, path):
+        """Restore balance on path of indices from root."""
+        left, right = self._left, self._right
+        for k in reversed(range(len(path))):
+            i = path[k]
+            new_i = self._avl_balance(i)
+            if new_i != i:
+                if k == 0:
+                    self._root_index = new_i
+                elif left[path[k - 1]] == i:
+                    left[path[k - 1]] = new_i
+                else:
+                    right[path[k - 1]] = new_i
+
+    def _update(self, i):
+        """Set height and size of node i from those of its children."""
+        height, size = self._height, self._size
+        left, right = self._left[i], self._right[i]
+        height[i] = 1 + max(height[left], height[right])
+        size[i] = 1 + size[left] + size[right]
+
+    def _rotate(self, i, children, other):
+        """Rotate subtree at i towards other side and return new root."""
+        j = children[i]
+        children[i] = other[j]
+        other[j] = i
+        self._update(i)
+        self._update(j)
+        return j
+
+    def _avl_balance(self, i):
+        """Update height of node i and rotate its subtree if unbalanced."""
+        height, left, right = self._height, self._left, self._right
+        self._update(i)
+        balance = height[left[i]] - height[right[i]]
+        if balance > 1:
+            if height[left[left[i]]] < height[right[left[i]]]:
+                left[i] = self._rotate(left[i], right, left)
+            return self._rotate(i, left, right)
+        if balance < -1:
+            if height[right[right[i]]] < height[left[right[i]]]:
+                right[i] = self._rotate(right[i], left, right)
+            return self._rotate(i, right, left)
+        return i
+
+
+def _build_balanced(values, start, stop):
+    """Build balanced subtree from values[start:stop] and return its root."""
+    if start == stop:
+        return None
+    mid = (start + stop) // 2
+    node = TreeNode(values[mid])
+    node.left = _build_balanced(values, start, mid)
+    node.right = _build_balanced(values, mid + 1, stop)
+    _update(node)
+    return node
+
+
+def _height(node):
+    """Height of subtree at node, 0 if node is None."""
+    return node.height if node else 0
+
+
+def _size(node):
+    """Size of subtree at node, 0 if node is None."""
+    return node.size if node else 0
+
+
+def _update(node):
+    """Set height and size of node from those of its children."""
+    node.height = 1 + max(_height(node.left), _height(node.right))
+    node.size = 1 + _size(node.left) + _size(node.right)
+
+
+def _rotate_left(node):
+    """Rotate subtree at node left and return its new root."""
+    new_node = node.right
+    node.right = new_node.left
+    new_node.left = node
+    _update(node)
+    _update(new_node)
+    return new_node
+
+
+def _rotate_right(node):
+    """Rotate subtree at node right and return its new root."""
+    new_node = node.left
+    node.left = new_node.right
+    new_node.right = node
+    _update(node)
+    _update(new_node)
+    return new_node
+
+
+def _avl_balance(node):
+    """
+    Update height of node and rotate its subtree if unbalanced.
+
+    Parameters
+    ----------
+    node: TreeNode
+        Node whose children are balanced.
+
+    Returns
+    -------
+    node: TreeNode
+        New root of subtree.
+
+    """
+    _update(node)
+    balance = _height(node.left) - _height(node.right)
+    if balance > 1:
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotate_left(node.left)
+        return _rotate_right(node)
+    if balance < -1:
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotate_right(node.right)
+        return _rotate_left(node)
+    return node
@@ -0,0 +1,157 @@
+"""Disjoint set data structures."""
+
+from array import array
+
+
+class UnionFind:
+    """
+    Array-backed disjoint set forest over the integers 0, ..., n - 1.
+
+    Sets are trees stored as an array of parent indices. Union by rank keeps
+    the trees shallow and find compresses the path it walks, so a sequence
+    of operations takes close to constant time each. Elements can be added
+    at any time, so the number of sets can be kept up to date while edges
+    of a graph are streamed in.
+
+    For a helpful discussion of union-find see:
+
+    https://algs4.cs.princeton.edu/15uf/
+
+    Parameters
+    ----------
+    n : int, default 0
+        Number of elements, each starting in its own set.
+
+    Attributes
+    ----------
+    count : int
+        Number of disjoint sets.
+
+    """
+
+    def __init__(self, n=0):
+        """Class constructor."""
+        self._parent = array('q', range(n))
+        # rank is an upper bound on tree height, at most log2(n)
+        self._rank = array('B', bytes(n))
+        self._count = n
+
+    def __len__(self):
+        """Number of elements."""
+        return len(self._parent)
+
+    @property
+    def count(self):
+        """Get number of disjoint sets."""
+        return self._count
+
+    def add(self):
+        """Add new element in its own set.
+
+        Returns
+        -------
+        i : int
+            New element.
+        """
+        i = len(self._parent)
+        self._parent.append(i)
+        self._rank.append(0)
+        self._count += 1
+        return i
+
+    def find(self, i):
+        """
+        Find representative element of set containing i.
+
+        Parameters
+        ----------
+        i : int
+            Element to find set of.
+
+        Returns
+        -------
+        root : int
+            Representative of set, the same for all elements in it.
+
+        """
+        parent = self._parent
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        # point every element on the path straight at the root
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    def union(self, i, j):
+        """
+        Merge sets containing i and j.
+
+        Parameters
+        ----------
+        i : int
+            Element of first set.
+        j : int
+            Element of second set.
+
+        Returns
+        -------
+        merged : bool
+            False if i and j were already in the same set.
+
+        """
+        i, j = self.find(i), self.find(j)
+        if i == j:
+            return False
+        rank = self._rank
+        # attach shorter tree under taller tree
+        if rank[i] < rank[j]:
+            i, j = j, i
+        self._parent[j] = i
+        if rank[i] == rank[j]:
+            rank[i] += 1
+        self._count -= 1
+        return True
+
+    def union_edges(self, edges):
+        """
+        Merge sets joined by many edges.
+
+        Parameters
+        ----------
+        edges : iterable
+            Iterable of (i, j) pairs of elements, for example a list of
+            tuples or a two column array.
+
+        Returns
+        -------
+        count : int
+            Number of disjoint sets afterwards.
+
+        """
+        for i, j in edges:
+            self.union(i, j)
+        return self._count
+
+    def connected(self, i, j):
+        """Check if i and j are in the same set."""
+        return self.find(i) == self.find(j)
+
+    def labels(self):
+        """
+        Label elements by set.
+
+        Returns
+        -------
+        labels : array
+            Integer array with the set label of each element. Labels are
+            0, ..., count - 1, numbered in order of the first element of
+            each set.
+
+        """
+        labels = array('q', bytes(8 * len(self._parent)))
+        root_labels = {}
+        for i in range(len(self._parent)):
+            labels[i] = root_labels.setdefault(self.find(i),
+                                               len(root_labels))
+        return labels
@@ -1,7 +1,11 @@
 """Unit tests for graph structures."""
 
+import pickle
+import weakref
 import pytest
-from structures.graph import Vertex, Path, DirGraph
+from structures.graph import (Vertex, Path, FrozenPath, LinkedPath,
+                              DirGraph, Graph, WeightedDirGraph,
+                              WeightedGraph, CSRGraph)
 
 
 class TestVertex:
@@ -30,10 +34,31 @@ class TestVertex:
         except Exception as e:
             assert isinstance(e, AttributeError)
 
+    def test_data_setter_after_deleter(self, boston_vertex):
+        """Data can be set again after being deleted."""
+        del boston_vertex.data
+        boston_vertex.data = 'Seattle'
+        assert boston_vertex.data == 'Seattle'
+
     def test_str(self, boston_vertex):
         """__str__ returns correct value."""
         assert str(boston_vertex) == 'Boston'
 
+    def test_slots(self, boston_vertex):
+        """Vertex has no instance dictionary."""
+        assert not hasattr(boston_vertex, '__dict__')
+
+    def test_weakref(self, boston_vertex):
+        """Vertex can be weakly referenced."""
+        ref = weakref.ref(boston_vertex)
+        assert ref() is boston_vertex
+
+    def test_pickle(self, boston_vertex):
+        """Pickled vertex keeps its data."""
+        g = DirGraph({boston_vertex: []})
+        vertex = pickle.loads(pickle.dumps(g.v('Boston')))
+        assert vertex.data == 'Boston'
+
 
 class TestPath:
     """Tests for Path class."""
@@ -60,6 +85,11 @@ class TestPath:
         _, vertices, path = city_path_1
         assert path.vertices == vertices
 
+    def test_weakref(self, city_path_1):
+        """Path can be weakly referenced."""
+        _, _, path = city_path_1
+        assert weakref.ref(path)() is path
+
     def test_vertices_setter(self, city_path_1, city_path_2):
         """Data attribute setter sets correct value."""
         _, _, path1 = city_path_1
@@ -114,6 +144,114 @@ class TestPath:
         assert path.vertices == vertices
 
 
+class TestFrozenPath:
+    """Tests for FrozenPath class."""
+
+    @pytest.fixture
+    def city_path(scope='class'):
+        """Frozen path of vertices with city names for vertex data."""
+        names = ['Boston', 'Providence', 'New York']
+        vertices = [Vertex(name) for name in names]
+        return names, vertices, FrozenPath(vertices)
+
+    def test_str(self, city_path):
+        """__str__ returns correct value."""
+        names, _, path = city_path
+        assert str(path) == str(names)
+
+    def test_len_iter(self, city_path):
+        """__len__ and __iter__ return correct values."""
+        _, vertices, path = city_path
+        assert len(path) == len(vertices)
+        assert list(path) == vertices
+
+    def test_contains(self, city_path):
+        """Membership is checked correctly."""
+        _, vertices, path = city_path
+        assert all(vertex in path for vertex in vertices)
+        assert Vertex('Boston') not in path
+
+    def test_add(self, city_path):
+        """Concatenation returns new path and leaves operands unchanged."""
+        _, vertices, path = city_path
+        seattle = Vertex('Seattle')
+        new_path = path + FrozenPath([seattle])
+        assert list(new_path) == vertices + [seattle]
+        assert seattle in new_path
+        assert seattle not in path
+
+    def test_eq_hash(self, city_path):
+        """Paths with the same vertices are equal and hash equal."""
+        _, vertices, path = city_path
+        assert path == FrozenPath(vertices)
+        assert len({path, FrozenPath(vertices)}) == 1
+        assert path != FrozenPath(vertices[:2])
+
+    def test_immutable(self, city_path):
+        """Adding vertex raises an error."""
+        _, _, path = city_path
+        with pytest.raises(ValueError):
+            path.addvertex(0, Vertex('Seattle'))
+
+
+class TestLinkedPath:
+    """Tests for LinkedPath class."""
+
+    @pytest.fixture
+    def city_path(scope='class'):
+        """Linked path of vertices with city names for vertex data."""
+        names = ['Boston', 'Providence', 'New York']
+        vertices = [Vertex(name) for name in names]
+        return names, vertices, LinkedPath(vertices)
+
+    def test_str_len(self, city_path):
+        """__str__ and __len__ return correct values."""
+        names, _, path = city_path
+        assert str(path) == str(names)
+        assert len(path) == 3
+        assert len(LinkedPath()) == 0
+
+    def test_extend_shares_prefix(self, city_path):
+        """Extensions share the original path and leave it unchanged."""
+        _, vertices, path = city_path
+        seattle, denver = Vertex('Seattle'), Vertex('Denver')
+        path1, path2 = path.extend(seattle), path.extend(denver)
+        assert path1.prefix is path and path2.prefix is path
+        assert list(path1) == vertices + [seattle]
+        assert list(path2) == vertices + [denver]
+        assert list(path) == vertices
+        assert path1.last == seattle
+
+    def test_contains(self, city_path):
+        """Membership is checked correctly."""
+        _, vertices, path = city_path
+        assert all(vertex in path for vertex in vertices)
+        assert Vertex('Boston') not in path
+
+    def test_add(self, city_path):
+        """Concatenation has vertices of both paths."""
+        _, vertices, path = city_path
+        other = LinkedPath([Vertex('Seattle')])
+        assert list(path + other) == vertices + list(other)
+        assert (path + other).prefix is path
+
+    def test_eq_hash(self, city_path):
+        """Paths with the same vertices are equal and hash equal."""
+        _, vertices, path = city_path
+        built = LinkedPath(vertices[:1]).extend(vertices[1]).extend(
+            vertices[2])
+        assert path == built
+        assert len({path, built}) == 1
+
+    def test_long_path(self):
+        """Long chain of extensions is built without recursion."""
+        vertices = [Vertex(i) for i in range(5000)]
+        path = LinkedPath()
+        for vertex in vertices:
+            path = path.extend(vertex)
+        assert path.topath().vertices == vertices
+
+
 class TestDirGraph:
     """Tests for Directed graph class."""
 
@@ -175,10 +313,13 @@ class TestDirGraph:
         """Vertices attribute deleter deletes correctly."""
         _, vertices, _, g = city_graph_no_edges
         del g.vertices
-        try:
+        with pytest.raises(AttributeError):
             g.vertices
-        except Exception as e:
-            assert isinstance(e, AttributeError)
+
+    def test_no_vertex_list_copy(self, city_graph_no_edges):
+        """Vertices are only stored in adjacency dictionary."""
+        _, _, _, g = city_graph_no_edges
+        assert not hasattr(g, '_vertices')
 
     def test_v(self, city_graph_no_edges):
         """Test correct vertex is returned."""
@@ -217,3 +358,301 @@ class TestDirGraph:
             parents = [g.v(edge[0]) for edge in edges
                        if g.v(edge[1]) == vertex]
             assert parents == g.parents(vertex)
+
+    def test_parents_multiple_edges(self, city_graph_no_edges):
+        """Parent with several edges to vertex is returned once."""
+        _, vertices, _, g = city_graph_no_edges
+        g.addedge(vertices[0], vertices[1])
+        g.addedge(vertices[2], vertices[1])
+        g.addedge(vertices[0], vertices[1])
+        assert g.parents(vertices[1]) == [vertices[0], vertices[2]]
+
+    def test_parents_new_vertex(self, city_graph):
+        """New vertex has no parents until an edge is added."""
+        _, _, _, g = city_graph
+        seattle = Vertex('Seattle')
+        g.addvertex(seattle)
+        assert g.parents(seattle) == []
+        g.addedge(g.v('Boston'), seattle)
+        assert g.parents(seattle) == [g.v('Boston')]
+
+    def test_contains(self, city_graph_no_edges):
+        """Membership test finds only vertices of graph."""
+        _, vertices, _, g = city_graph_no_edges
+        assert all(vertex in g for vertex in vertices)
+        assert Vertex('Boston') not in g
+
+    def test_default_adj_not_shared(self):
+        """Graphs constructed without adjacency do not share state."""
+        g1, g2 = DirGraph(), DirGraph()
+        g1.addvertex(Vertex('Boston'))
+        assert g2.vertices == []
+
+    def test_v_after_data_change(self, city_graph_no_edges):
+        """Index follows changes to vertex data."""
+        _, vertices, _, g = city_graph_no_edges
+        vertices[0].data = 'Seattle'
+        assert g.v('Seattle') == vertices[0]
+        with pytest.raises(ValueError):
+            g.v('Boston')
+
+    def test_v_duplicate_data(self, city_graph_no_edges):
+        """All vertices with data are returned."""
+        _, vertices, _, g = city_graph_no_edges
+        other_boston = Vertex('Boston')
+        g.addvertex(other_boston)
+        assert g.v('Boston') == [vertices[0], other_boston]
+
+    def test_v_duplicate_data_removed(self, city_graph_no_edges):
+        """Index follows data shared and then no longer shared."""
+        _, vertices, _, g = city_graph_no_edges
+        other_boston = Vertex('Boston')
+        g.addvertex(other_boston)
+        g.removevertex(vertices[0])
+        assert g.v('Boston') == other_boston
+        other_boston.data = 'Seattle'
+        with pytest.raises(ValueError):
+            g.v('Boston')
+
+    def test_v_after_data_deleted(self, city_graph_no_edges):
+        """Index follows data deleted and set again."""
+        _, vertices, _, g = city_graph_no_edges
+        del vertices[0].data
+        with pytest.raises(ValueError):
+            g.v('Boston')
+        vertices[0].data = 'Seattle'
+        assert g.v('Seattle') == vertices[0]
+
+    def test_v_two_graphs(self, city_graph_no_edges):
+        """Index of every graph holding a vertex follows its data."""
+        _, vertices, adj, g = city_graph_no_edges
+        g2 = DirGraph(dict(adj))
+        vertices[0].data = 'Seattle'
+        assert g.v('Seattle') == g2.v('Seattle') == vertices[0]
+
+    def test_v_unhashable_data(self, city_graph_no_edges):
+        """Vertices with unhashable data are found."""
+        _, _, _, g = city_graph_no_edges
+        vertex = Vertex(['Seattle'])
+        g.addvertex(vertex)
+        assert g.v(['Seattle']) == vertex
+
+    def test_v_no_index(self, city_graph_no_edges):
+        """Lookup by data works without index."""
+        _, vertices, adj, _ = city_graph_no_edges
+        g = DirGraph(adj, index=False)
+        for vertex in vertices:
+            assert g.v(vertex.data) == vertex
+
+    def test_removeedge(self, city_graph):
+        """Removed edge is gone from children and parents."""
+        _, _, _, g = city_graph
+        boston, new_york = g.v('Boston'), g.v('New York')
+        version = g.version
+        g.removeedge(boston, new_york)
+        assert new_york not in g.children(boston)
+        assert boston not in g.parents(new_york)
+        assert g.version > version
+        with pytest.raises(ValueError):
+            g.removeedge(boston, new_york)
+
+    def test_removeedge_multiple_edges(self, city_graph_no_edges):
+        """Parent stays until its last edge is removed."""
+        _, vertices, _, g = city_graph_no_edges
+        g.addedge(vertices[0], vertices[1])
+        g.addedge(vertices[0], vertices[1])
+        g.removeedge(vertices[0], vertices[1])
+        assert g.parents(vertices[1]) == [vertices[0]]
+        g.removeedge(vertices[0], vertices[1])
+        assert g.parents(vertices[1]) == []
+
+    def test_removevertex(self, city_graph):
+        """Removed vertex is gone with all its edges."""
+        _, _, _, g = city_graph
+        new_york = g.v('New York')
+        g.removevertex(new_york)
+        assert new_york not in g
+        for vertex in g.vertices:
+            assert new_york not in g.children(vertex)
+            assert new_york not in g.parents(vertex)
+        assert g.parents(g.v('Chicago')) == []
+        with pytest.raises(ValueError):
+            g.v('New York')
+
+    def test_add_edges(self, city_graph_no_edges, city_graph):
+        """Bulk added edges match edges added one at a time."""
+        _, _, _, g = city_graph_no_edges
+        _, _, edges, true_g = city_graph
+        g.add_edges((g.v(city1), g.v(city2)) for city1, city2 in edges)
+        assert str(g) == str(true_g)
+        for vertex in g.vertices:
+            assert ([str(p) for p in g.parents(vertex)] ==
+                    [str(p) for p in true_g.parents(true_g.v(vertex.data))])
+
+    def test_add_edges_invalid(self, city_graph_no_edges):
+        """Graph is unchanged if any edge is invalid."""
+        _, vertices, _, g = city_graph_no_edges
+        with pytest.raises(ValueError):
+            g.add_edges([(vertices[0], vertices[1]),
+                         (vertices[0], Vertex('Seattle'))])
+        assert g.children(vertices[0]) == []
+
+    def test_add_edges_dedup(self, city_graph_no_edges):
+        """Repeated edges are skipped with dedup."""
+        _, vertices, _, g = city_graph_no_edges
+        g.addedge(vertices[0], vertices[1])
+        g.add_edges([(vertices[0], vertices[1]), (vertices[0], vertices[2]),
+                     (vertices[0], vertices[2])], dedup=True)
+        assert g.children(vertices[0]) == [vertices[1], vertices[2]]
+
+    def test_from_edges(self):
+        """Graph built from edge list has vertices in order of appearance."""
+        vertices = [Vertex(name) for name in ['Boston', 'Providence',
+                                              'New York']]
+        edges = [(vertices[1], vertices[0]), (vertices[1], vertices[2])]
+        g = DirGraph.from_edges(edges)
+        assert g.vertices == [vertices[1], vertices[0], vertices[2]]
+        assert g.children(vertices[1]) == [vertices[0], vertices[2]]
+
+
+class TestGraph:
+    """Tests for undirected graph class."""
+
+    def test_from_edges(self):
+        """Edges are added in both directions."""
+        vertices = [Vertex(name) for name in ['Boston', 'Providence',
+                                              'New York']]
+        edges = [(vertices[0], vertices[1]), (vertices[0], vertices[2])]
+        g = Graph.from_edges(edges)
+        assert g.children(vertices[0]) == [vertices[1], vertices[2]]
+        assert g.children(vertices[1]) == [vertices[0]]
+        assert g.parents(vertices[0]) == [vertices[1], vertices[2]]
+
+    def test_removeedge(self):
+        """Edges are removed in both directions."""
+        vertices = [Vertex(name) for name in ['Boston', 'Providence']]
+        g = Graph.from_edges([vertices])
+        g.removeedge(vertices[1], vertices[0])
+        assert g.children(vertices[0]) == []
+        assert g.children(vertices[1]) == []
+
+
+class TestWeightedDirGraph:
+    """Tests for weighted directed graph class."""
+
+    @pytest.fixture
+    def triangle(scope='class'):
+        """Weighted graph on three vertices."""
+        vertices = [Vertex(name) for name in ['Boston', 'Providence',
+                                              'New York']]
+        b, p, n = vertices
+        g = WeightedDirGraph.from_edges([(b, p, 1.5), (p, n, 3.0), (b, n)])
+        return vertices, g
+
+    def test_weight(self, triangle):
+        """Edge weights are stored, default 1."""
+        (b, p, n), g = triangle
+        assert g.weight(b, p) == 1.5
+        assert g.weight(p, n) == 3.0
+        assert g.weight(b, n) == 1.0
+        with pytest.raises(ValueError):
+            g.weight(n, b)
+
+    def test_weighted_children(self, triangle):
+        """Children are returned with weights."""
+        (b, p, n), g = triangle
+        assert g.weighted_children(b) == [(p, 1.5), (n, 1.0)]
+
+    def test_removeedge(self, triangle):
+        """Weight is removed with edge."""
+        (b, p, n), g = triangle
+        g.removeedge(b, p)
+        assert g.weighted_children(b) == [(n, 1.0)]
+
+    def test_removevertex(self, triangle):
+        """Weights of edges to removed vertex are removed."""
+        (b, p, n), g = triangle
+        g.removevertex(p)
+        assert g.weighted_children(b) == [(n, 1.0)]
+        assert p not in g.weights
+
+    def test_addedge(self, triangle):
+        """Single weighted edge is added."""
+        (b, p, n), g = triangle
+        g.addedge(n, b, 2.5)
+        assert g.weighted_children(n) == [(b, 2.5)]
+        assert g.parents(b) == [n]
+
+    def test_weights_parallel_to_adj(self, triangle):
+        """Weights given with adjacency dict must match children."""
+        (b, p, n), _ = triangle
+        with pytest.raises(ValueError):
+            WeightedDirGraph({b: [p, n], p: [], n: []}, weights={b: [1.0]})
+
+
+class TestWeightedGraph:
+    """Tests for weighted undirected graph class."""
+
+    def test_addedge(self):
+        """Weighted edge is added in both directions."""
+        b, p = Vertex('Boston'), Vertex('Providence')
+        g = WeightedGraph({b: [], p: []})
+        g.addedge(b, p, 2.0)
+        assert g.weighted_children(b) == [(p, 2.0)]
+        assert g.weighted_children(p) == [(b, 2.0)]
+
+
+class TestCSRGraph:
+    """Tests for compressed sparse row graph class."""
+
+    @pytest.fixture
+    def city_graph(scope='class'):
+        """Graph of vertices with city names as data and its CSR copy."""
+        names = ['Boston', 'Providence', 'New York', 'Chicago',
+                 'Denver', 'Phoenix', 'Los Angeles']
+        vertices = [Vertex(name) for name in names]
+        g = DirGraph({vertex: [] for vertex in vertices})
+
+        edges = [('Boston', 'Providence'), ('Boston', 'New York'),
+                 ('Providence', 'Boston'), ('Providence', 'New York'),
+                 ('New York', 'Chicago'), ('Chicago', 'Phoenix'),
+                 ('Chicago', 'Denver'), ('Denver', 'Phoenix'),
+                 ('Denver', 'New York'), ('Los Angeles', 'Boston')]
+        for edge in edges:
+            city1, city2 = edge
+            g.addedge(g.v(city1), g.v(city2))
+        return names, edges, g, CSRGraph.from_dirgraph(g)
+
+    def test_from_dirgraph_children(self, city_graph):
+        """Children agree with adjacency list graph."""
+        _, _, g, csr = city_graph
+        assert csr.vertices == g.vertices
+        for vertex in g.vertices:
+            assert csr.children(vertex) == g.children(vertex)
+
+    def test_from_dirgraph_parents(self, city_graph):
+        """Parents agree with adjacency list graph."""
+        _, _, g, csr = city_graph
+        for vertex in g.vertices:
+            assert csr.parents(vertex) == g.parents(vertex)
+
+    def test_from_edges(self, city_graph):
+        """Graph built from id edge list has correct arrays."""
+        names, edges, g, csr = city_graph
+        id_edges = [(names.index(p), names.index(c)) for p, c in edges]
+        new_csr = CSRGraph.from_edges(id_edges, g.vertices)
+        assert list(new_csr.offsets) == list(csr.offsets)
+        assert list(new_csr.targets) == list(csr.targets)
+
+    def test_children_ids(self, city_graph):
+        """Child ids of vertex are correct."""
+        names, _, _, csr = city_graph
+        chicago = names.index('Chicago')
+        assert list(csr.children_ids(chicago)) == [names.index('Phoenix'),
+                                                   names.index('Denver')]
+
+    def test_frozen(self, city_graph):
+        """Adding an edge raises an error."""
+        _, _, g, csr = city_graph
+        with pytest.raises(ValueError):
+            csr.addedge(g.v('Boston'), g.v('Phoenix'))
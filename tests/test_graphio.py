@@ -0,0 +1,125 @@
+"""Unit tests for graph reading and writing."""
+
+import pytest
+from algorithms.graphprocess import CSRGraphProcess
+from structures.graph import Vertex, DirGraph, Graph
+from structures.graphio import (read_edges, load_edges, write_edges,
+                                write_csr, open_csr)
+
+
+@pytest.fixture
+def city_graph(scope='module'):
+    """Graph of vertices with city names as data."""
+    names = ['Boston', 'Providence', 'New York', 'Chicago',
+             'Denver', 'Phoenix', 'Los Angeles']
+    vertices = [Vertex(name) for name in names]
+    g = DirGraph({vertex: [] for vertex in vertices})
+
+    edges = [('Boston', 'Providence'), ('Boston', 'New York'),
+             ('Providence', 'Boston'), ('Providence', 'New York'),
+             ('New York', 'Chicago'), ('Chicago', 'Phoenix'),
+             ('Chicago', 'Denver'), ('Denver', 'Phoenix'),
+             ('Denver', 'New York'), ('Los Angeles', 'Boston')]
+    for edge in edges:
+        city1, city2 = edge
+        g.addedge(g.v(city1), g.v(city2))
+    return edges, g
+
+
+class TestEdgeList:
+    """Tests for text edge lists."""
+
+    def test_read_edges_chunks(self, city_graph, tmp_path):
+        """Edges are read back in chunks of at most chunksize."""
+        edges, g = city_graph
+        path = tmp_path / 'cities.tsv'
+        write_edges(g, path)
+        chunks = list(read_edges(path, chunksize=4))
+        assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+        assert sorted(edge for chunk in chunks for edge in chunk) == \
+            sorted(edges)
+
+    def test_read_edges_csv(self, tmp_path):
+        """Comments and blank lines are skipped in CSV files."""
+        path = tmp_path / 'cities.csv'
+        path.write_text('# parent,child\nBoston,"New York"\n\n'
+                        'Chicago,Denver,extra\n')
+        chunks = list(read_edges(path, delimiter=','))
+        assert chunks == [[('Boston', 'New York'), ('Chicago', 'Denver')]]
+
+    def test_round_trip_comment_like_labels(self, tmp_path):
+        """Labels that look like comments or blank lines are kept."""
+        edges = [('#a', 'b'), (' ', ''), ('c', '#d')]
+        vertices = {label: Vertex(label) for edge in edges for label in edge}
+        g = DirGraph.from_edges((vertices[parent], vertices[child])
+                                for parent, child in edges)
+        path = tmp_path / 'labels.tsv'
+        write_edges(g, path)
+        assert list(read_edges(path)) == [edges]
+
+    def test_round_trip_multiline_labels(self, tmp_path):
+        """Quoted labels spanning lines, including blank lines, are kept."""
+        edges = [('x\n\ny', 'z'), ('a', 'b\n# c')]
+        vertices = {label: Vertex(label) for edge in edges for label in edge}
+        g = DirGraph.from_edges((vertices[parent], vertices[child])
+                                for parent, child in edges)
+        path = tmp_path / 'labels.tsv'
+        write_edges(g, path)
+        assert list(read_edges(path)) == [edges]
+
+    def test_read_edges_one_column(self, tmp_path):
+        """Row with one column raises error giving its line."""
+        path = tmp_path / 'cities.csv'
+        path.write_text('Boston,"New\nYork"\nChicago\n')
+        with pytest.raises(ValueError, match='line 3'):
+            list(read_edges(path, delimiter=','))
+
+    def test_load_edges(self, city_graph, tmp_path):
+        """Loaded graph has the same edges as the written graph."""
+        _, g = city_graph
+        path = tmp_path / 'cities.tsv'
+        write_edges(g, path)
+        new_g = load_edges(path, chunksize=3)
+        for vertex in g.vertices:
+            assert ([str(child) for child in g.children(vertex)] ==
+                    [str(child) for child in new_g.children(
+                        new_g.v(vertex.data))])
+
+    def test_load_edges_undirected(self, tmp_path):
+        """Undirected graph gets edges in both directions."""
+        path = tmp_path / 'cities.tsv'
+        path.write_text('Boston\tProvidence\n')
+        g = load_edges(path, graph_class=Graph)
+        assert g.children(g.v('Providence')) == [g.v('Boston')]
+
+
+class TestCSRFile:
+    """Tests for binary compressed sparse row files."""
+
+    def test_roundtrip(self, city_graph, tmp_path):
+        """Opened graph has the same vertices and edges."""
+        _, g = city_graph
+        path = tmp_path / 'cities.csr'
+        write_csr(g, path)
+        csr = open_csr(path)
+        assert [str(v) for v in csr.vertices] == [str(v) for v in g.vertices]
+        for vertex in g.vertices:
+            assert ([str(child) for child in g.children(vertex)] ==
+                    [str(child) for child in csr.children(
+                        csr.v(vertex.data))])
+
+    def test_process(self, city_graph, tmp_path):
+        """Graph processing runs on memory-mapped graph."""
+        _, g = city_graph
+        path = tmp_path / 'cities.csr'
+        write_csr(g, path)
+        csr = open_csr(path, graph_class=CSRGraphProcess)
+        shortpath = csr.bfs_it_shortpath(csr.v('Boston'), csr.v('Phoenix'))
+        assert str(shortpath) == "['Boston', 'New York', 'Chicago', 'Phoenix']"
+
+    def test_bad_file(self, tmp_path):
+        """Opening a file in another format raises an error."""
+        path = tmp_path / 'cities.tsv'
+        path.write_text('Boston\tProvidence\n' * 4)
+        with pytest.raises(ValueError):
+            open_csr(path)
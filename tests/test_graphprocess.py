@@ -1,7 +1,11 @@
 """Unit tests for graph processing methods."""
 
+import random
 import pytest
-from algorithms.graphprocess import DirGraphProcess
+from algorithms.graphprocess import (DirGraphProcess, GraphProcess,
+                                     CSRGraphProcess,
+                                     WeightedDirGraphProcess,
+                                     WeightedGraphProcess)
 from structures.graph import Vertex, Path
 
 
@@ -51,7 +55,7 @@ class TestDirGraphProcess:
         # get shortest path results
         g = city_graph
         v1, v2 = g.v('Boston'), g.v('Phoenix')
-        shortpath = g.dfs_rec_shortpath(v1, v2)
+        shortpath = g.dfs_it_shortpath(v1, v2)
         # create correct path
         truepath = "['Boston', 'New York', 'Chicago', 'Phoenix']"
         assert str(shortpath) == truepath
@@ -61,17 +65,55 @@ class TestDirGraphProcess:
         # get shortest path results
         g = city_graph
         v1, v2 = g.v('Boston'), g.v('Los Angeles')
-        shortpath = g.dfs_rec_shortpath(v1, v2)
+        shortpath = g.dfs_it_shortpath(v1, v2)
         # create correct path
         truepath = None
         assert shortpath == truepath
 
+    def test_dfs_it_shortpath_max_depth(self, city_graph):
+        """Check no path is returned if shortest path is too long."""
+        g = city_graph
+        v1, v2 = g.v('Boston'), g.v('Phoenix')
+        assert g.dfs_it_shortpath(v1, v2, max_depth=2) is None
+        assert len(g.dfs_it_shortpath(v1, v2, max_depth=3)) == 4
+
+    def test_dfs_shortpath_long_chain(self):
+        """Check shortest path on a chain longer than the recursion limit."""
+        vertices = [Vertex(i) for i in range(1200)]
+        g = DirGraphProcess.from_edges(zip(vertices, vertices[1:]))
+        g.addedge(vertices[0], vertices[1100])
+        shortpath = g.dfs_rec_shortpath(vertices[0], vertices[-1])
+        assert shortpath.vertices == vertices[:1] + vertices[1100:]
+
+    def test_dfs_it_shortpath_unreachable(self):
+        """Check unreachable end on a long chain is found quickly."""
+        vertices = [Vertex(i) for i in range(20000)]
+        g = DirGraphProcess.from_edges(zip(vertices, vertices[1:-1]),
+                                       vertices)
+        assert g.dfs_it_shortpath(vertices[0], vertices[-1]) is None
+
+    def test_dfs_it_shortpath_lengths(self):
+        """Check depth-first and breadth-first path lengths agree."""
+        rng = random.Random(1)
+        vertices = [Vertex(i) for i in range(40)]
+        edges = [(rng.choice(vertices), rng.choice(vertices))
+                 for _ in range(100)]
+        g = DirGraphProcess.from_edges(edges, vertices)
+        for _ in range(100):
+            v1, v2 = rng.choice(vertices), rng.choice(vertices)
+            path = g.bfs_it_shortpath(v1, v2)
+            dfs_path = g.dfs_it_shortpath(v1, v2)
+            if path is None:
+                assert dfs_path is None
+            else:
+                assert len(dfs_path) == len(path)
+
     def test_bfs_it_shortpath_1(self, city_graph):
         """Check shortest path is correct."""
         # get shortest path results
         g = city_graph
         v1, v2 = g.v('Boston'), g.v('Phoenix')
-        shortpath = g.dfs_rec_shortpath(v1, v2)
+        shortpath = g.bfs_it_shortpath(v1, v2)
         # create correct path
         truepath = "['Boston', 'New York', 'Chicago', 'Phoenix']"
         assert str(shortpath) == truepath
@@ -81,11 +123,76 @@ class TestDirGraphProcess:
         # get shortest path results
         g = city_graph
         v1, v2 = g.v('Boston'), g.v('Los Angeles')
-        shortpath = g.dfs_rec_shortpath(v1, v2)
+        shortpath = g.bfs_it_shortpath(v1, v2)
         # create correct path
         truepath = None
         assert shortpath == truepath
 
+    def test_bfs_it_shortpath_same_vertex(self, city_graph):
+        """Check shortest path from vertex to itself is the vertex."""
+        g = city_graph
+        shortpath = g.bfs_it_shortpath(g.v('Boston'), g.v('Boston'))
+        assert str(shortpath) == "['Boston']"
+
+    def test_bfs_it_shortpath_long_chain(self):
+        """Check shortest path on a chain longer than the recursion limit."""
+        vertices = [Vertex(i) for i in range(5000)]
+        g = DirGraphProcess.from_edges(zip(vertices, vertices[1:]))
+        shortpath = g.bfs_it_shortpath(vertices[0], vertices[-1])
+        assert shortpath.vertices == vertices
+
+    def test_bfs_shortpaths(self, city_graph):
+        """Check shortest paths to many vertices are correct."""
+        g = city_graph
+        ends = [g.v('Chicago'), g.v('Phoenix'), g.v('Los Angeles')]
+        shortpaths = g.bfs_shortpaths(g.v('Boston'), ends)
+        assert str(shortpaths[g.v('Chicago')]) == \
+            "['Boston', 'New York', 'Chicago']"
+        assert str(shortpaths[g.v('Phoenix')]) == \
+            "['Boston', 'New York', 'Chicago', 'Phoenix']"
+        assert shortpaths[g.v('Los Angeles')] is None
+
+    def test_bfs_shortpaths_all(self, city_graph):
+        """Check paths are found to all reachable vertices by default."""
+        g = city_graph
+        shortpaths = g.bfs_shortpaths(g.v('Chicago'))
+        assert {str(v) for v in shortpaths} == {'Chicago', 'Phoenix',
+                                                'Denver', 'New York'}
+
+    def test_bfs_bidir_shortpath_1(self, city_graph):
+        """Check bidirectional shortest path is correct."""
+        g = city_graph
+        v1, v2 = g.v('Boston'), g.v('Phoenix')
+        shortpath = g.bfs_bidir_shortpath(v1, v2)
+        truepath = "['Boston', 'New York', 'Chicago', 'Phoenix']"
+        assert str(shortpath) == truepath
+
+    def test_bfs_bidir_shortpath_2(self, city_graph):
+        """Check bidirectional shortest path returns None if no path."""
+        g = city_graph
+        v1, v2 = g.v('Boston'), g.v('Los Angeles')
+        assert g.bfs_bidir_shortpath(v1, v2) is None
+
+    def test_bfs_bidir_shortpath_lengths(self):
+        """Check bidirectional and one-sided path lengths agree."""
+        rng = random.Random(0)
+        vertices = [Vertex(i) for i in range(60)]
+        edges = [(rng.choice(vertices), rng.choice(vertices))
+                 for _ in range(150)]
+        g = DirGraphProcess.from_edges(edges, vertices)
+        for _ in range(100):
+            v1, v2 = rng.choice(vertices), rng.choice(vertices)
+            path = g.bfs_it_shortpath(v1, v2)
+            bidir_path = g.bfs_bidir_shortpath(v1, v2)
+            if path is None:
+                assert bidir_path is None
+            else:
+                assert len(bidir_path) == len(path)
+                assert bidir_path.vertices[0] == v1
+                assert bidir_path.vertices[-1] == v2
+                for parent, child in zip(bidir_path, bidir_path.vertices[1:]):
+                    assert child in g.children(parent)
+
     def test_dfs_rec_traversal_1(self, city_graph):
         """Check traversal is correct."""
         # get shortest path results
@@ -107,3 +214,586 @@ class TestDirGraphProcess:
         # create correct path
         true_reachable = {phoenix}
         assert reachable == true_reachable
+
+    def test_dfs_rec_traversal_default(self, city_graph):
+        """Check traversals without reachable set do not share state."""
+        g = city_graph
+        g.dfs_rec_traversal(g.v('Boston'))
+        phoenix = g.v('Phoenix')
+        assert g.dfs_rec_traversal(phoenix) == {phoenix}
+        assert g.dfs_it_traversal(phoenix) == {phoenix}
+
+    def test_bfs_it_traversal(self, city_graph):
+        """Check traversal is in order of distance."""
+        g = city_graph
+        traversal = g.bfs_it_traversal(g.v('Boston'))
+        assert [str(v) for v in traversal] == [
+            'Boston', 'Providence', 'New York', 'Chicago', 'Phoenix',
+            'Denver']
+
+    def test_dfs_preorder(self, city_graph):
+        """Check vertices are yielded in preorder."""
+        g = city_graph
+        preorder = g.dfs_preorder(g.v('Boston'))
+        assert [str(v) for v in preorder] == [
+            'Boston', 'Providence', 'New York', 'Chicago', 'Phoenix',
+            'Denver']
+
+    def test_dfs_preorder_lazy(self, city_graph):
+        """Check traversal can be stopped early."""
+        g = city_graph
+        visited = set()
+        preorder = g.dfs_preorder(g.v('Boston'), visited)
+        assert next(preorder) == g.v('Boston')
+        assert visited == {g.v('Boston')}
+
+    def test_dfs_postorder(self, city_graph):
+        """Check vertices are yielded in postorder."""
+        g = city_graph
+        postorder = g.dfs_postorder(g.v('Boston'))
+        assert [str(v) for v in postorder] == [
+            'Phoenix', 'Denver', 'Chicago', 'New York', 'Providence',
+            'Boston']
+
+    def test_bfs_levels(self, city_graph):
+        """Check vertices are grouped by distance."""
+        g = city_graph
+        levels = g.bfs_levels(g.v('Boston'))
+        assert [[str(v) for v in level] for level in levels] == [
+            ['Boston'], ['Providence', 'New York'], ['Chicago'],
+            ['Phoenix', 'Denver']]
+
+    def test_traversal_start_not_in_graph(self, city_graph):
+        """Check lazy traversals reject a missing start when called."""
+        g = city_graph
+        for traversal in (g.dfs_preorder, g.dfs_postorder,
+                          g.bfs_traversal, g.bfs_levels):
+            with pytest.raises(ValueError):
+                traversal(Vertex('Seattle'))
+
+    def test_dfs_preorder_long_chain(self):
+        """Check traversal of a chain longer than the recursion limit."""
+        vertices = [Vertex(i) for i in range(5000)]
+        g = DirGraphProcess.from_edges(zip(vertices, vertices[1:]))
+        assert list(g.dfs_preorder(vertices[0])) == vertices
+        assert g.dfs_rec_traversal(vertices[0]) == set(vertices)
+
+    def test_reachability_index(self, city_graph):
+        """Check reachability agrees with traversal for all pairs."""
+        g = city_graph
+        index = g.reachability_index()
+        for vertex in g.vertices:
+            reachable = g.dfs_it_traversal(vertex)
+            for end in g.vertices:
+                assert index.reachable(vertex, end) == (end in reachable)
+
+    def test_reachability_index_random(self):
+        """Check reachability agrees with traversal on random graph."""
+        rng = random.Random(2)
+        vertices = [Vertex(i) for i in range(50)]
+        edges = [(rng.choice(vertices), rng.choice(vertices))
+                 for _ in range(70)]
+        g = DirGraphProcess.from_edges(edges, vertices)
+        index = g.reachability_index()
+        for vertex in vertices:
+            reachable = g.dfs_it_traversal(vertex)
+            assert index.descendants([vertex]) == reachable
+            for end in vertices:
+                assert index.reachable(vertex, end) == (end in reachable)
+
+    def test_reachability_index_descendants(self, city_graph):
+        """Check vertices reachable from several starts are correct."""
+        g = city_graph
+        index = g.reachability_index()
+        descendants = index.descendants([g.v('Phoenix'), g.v('Denver')])
+        assert {str(v) for v in descendants} == {'Phoenix', 'Denver',
+                                                 'New York', 'Chicago'}
+
+    def test_strongly_connected_components(self, city_graph):
+        """Check components are correct and in reverse topological order."""
+        g = city_graph
+        components = g.strongly_connected_components()
+        assert [sorted(str(v) for v in component)
+                for component in components] == [
+            ['Phoenix'], ['Chicago', 'Denver', 'New York'],
+            ['Boston', 'Providence'], ['Los Angeles']]
+
+    def test_strongly_connected_components_long_cycle(self):
+        """Check a cycle longer than the recursion limit is one component."""
+        vertices = [Vertex(i) for i in range(5000)]
+        g = DirGraphProcess.from_edges(zip(vertices, vertices[1:] +
+                                           vertices[:1]))
+        assert len(g.strongly_connected_components()) == 1
+
+    def test_topological_sort(self):
+        """Check every vertex comes before its children."""
+        rng = random.Random(3)
+        vertices = [Vertex(i) for i in range(50)]
+        edges = [tuple(sorted(rng.sample(vertices, 2), key=vertices.index))
+                 for _ in range(100)]
+        g = DirGraphProcess.from_edges(edges, vertices)
+        position = {v: i for i, v in enumerate(g.topological_sort())}
+        assert len(position) == len(vertices)
+        for parent, child in edges:
+            assert position[parent] < position[child]
+
+    def test_topological_sort_cycle(self, city_graph):
+        """Check graph with a cycle raises an error."""
+        with pytest.raises(ValueError):
+            city_graph.topological_sort()
+
+    def test_condensation(self, city_graph):
+        """Check condensation is acyclic with correct edges."""
+        g = city_graph
+        dag = g.condensation()
+        names = [sorted(str(v) for v in vertex.data)
+                 for vertex in dag.topological_sort()]
+        assert names == [['Los Angeles'], ['Boston', 'Providence'],
+                         ['Chicago', 'Denver', 'New York'], ['Phoenix']]
+        for vertex in dag.vertices:
+            assert len(dag.children(vertex)) == (vertex.data[0] !=
+                                                 g.v('Phoenix'))
+
+    def test_bfs_distance_matrix(self, city_graph):
+        """Check distances agree with shortest paths."""
+        g = city_graph
+        sources = g.vertices[:4]
+        distances = g.bfs_distance_matrix(sources, max_workers=1)
+        for source, row in zip(sources, distances):
+            for target, dist in zip(g.vertices, row):
+                path = g.bfs_it_shortpath(source, target)
+                assert dist == (-1 if path is None else len(path) - 1)
+
+    def test_bfs_distance_matrix_parallel(self, city_graph):
+        """Check worker processes give the same distances."""
+        g = city_graph
+        targets = [g.v('Phoenix'), g.v('Boston')]
+        distances = g.bfs_distance_matrix(g.vertices, targets, max_workers=2,
+                                          chunksize=3)
+        assert [list(row) for row in distances] == \
+            [list(row) for row in g.bfs_distance_matrix(
+                g.vertices, targets, max_workers=1)]
+        assert list(distances[0]) == [3, 0]
+
+    def test_cache_hits(self, city_graph):
+        """Check repeated queries are answered from cache."""
+        g = city_graph
+        g.enable_cache()
+        v1, v2 = g.v('Boston'), g.v('Phoenix')
+        path = g.bfs_it_shortpath(v1, v2)
+        assert g.bfs_it_shortpath(v1, v2).vertices == path.vertices
+        g.bfs_bidir_shortpath(v1, v2)
+        assert g.cache_info() == (1, 2, 128, 2)
+
+    def test_cache_copies(self, city_graph):
+        """Check modifying a returned path leaves cached path unchanged."""
+        g = city_graph
+        g.enable_cache()
+        v1, v2 = g.v('Boston'), g.v('Phoenix')
+        path = g.bfs_it_shortpath(v1, v2)
+        path.removevertex(v2)
+        hit = g.bfs_it_shortpath(v1, v2)
+        assert len(hit) == 4
+        hit.removevertex(v1)
+        assert len(g.bfs_it_shortpath(v1, v2)) == 4
+
+    def test_cache_default_arguments(self, city_graph):
+        """Check calls differing only in defaults share one entry."""
+        g = city_graph
+        g.enable_cache()
+        v1, v2 = g.v('Boston'), g.v('Phoenix')
+        g.dfs_rec_shortpath(v1, v2)
+        g.dfs_it_shortpath(v1, v2)
+        g.dfs_it_shortpath(v1, end=v2, max_depth=None)
+        assert g.cache_info() == (2, 1, 128, 1)
+
+    def test_cache_invalidation(self, city_graph):
+        """Check cached results are discarded when graph changes."""
+        g = city_graph
+        g.enable_cache()
+        v1, v2 = g.v('Boston'), g.v('Phoenix')
+        assert len(g.bfs_it_shortpath(v1, v2)) == 4
+        g.addedge(v1, v2)
+        assert len(g.bfs_it_shortpath(v1, v2)) == 2
+        assert g.cache_info().hits == 0
+
+    def test_cache_eviction(self, city_graph):
+        """Check least recently used result is evicted."""
+        g = city_graph
+        g.enable_cache(maxsize=2)
+        boston = g.v('Boston')
+        g.bfs_it_shortpath(boston, g.v('Chicago'))
+        g.bfs_it_shortpath(boston, g.v('Denver'))
+        g.bfs_it_shortpath(boston, g.v('Chicago'))
+        g.bfs_it_shortpath(boston, g.v('Phoenix'))
+        g.bfs_it_shortpath(boston, g.v('Chicago'))
+        g.bfs_it_shortpath(boston, g.v('Denver'))
+        assert g.cache_info() == (2, 4, 2, 2)
+
+    def test_cache_disabled(self, city_graph):
+        """Check no statistics are kept without cache."""
+        g = city_graph
+        g.bfs_it_shortpath(g.v('Boston'), g.v('Phoenix'))
+        assert g.cache_info() is None
+
+    def test_incremental_bfs(self, city_graph):
+        """Check distances follow edge insertions and deletions."""
+        g = city_graph
+        tracker = g.incremental_bfs(g.v('Boston'))
+        assert tracker.distance(g.v('Phoenix')) == 3
+        tracker.addedge(g.v('Providence'), g.v('Denver'))
+        assert tracker.distance(g.v('Phoenix')) == 3
+        assert tracker.distance(g.v('Denver')) == 2
+        tracker.removeedge(g.v('Boston'), g.v('New York'))
+        assert tracker.distance(g.v('New York')) == 2
+        assert tracker.distance(g.v('Chicago')) == 3
+        tracker.removevertex(g.v('Providence'))
+        assert tracker.distances == {g.v('Boston'): 0}
+        assert tracker.distance(g.v('Los Angeles')) is None
+
+    def test_incremental_bfs_random(self):
+        """Check distances agree with a fresh search after random edits."""
+        rng = random.Random(4)
+        vertices = [Vertex(i) for i in range(30)]
+        edges = [(rng.choice(vertices), rng.choice(vertices))
+                 for _ in range(60)]
+        g = DirGraphProcess.from_edges(edges, vertices)
+        tracker = g.incremental_bfs(vertices[0])
+        for _ in range(200):
+            if rng.random() < 0.5:
+                edge = (rng.choice(vertices), rng.choice(vertices))
+                tracker.addedge(*edge)
+                edges.append(edge)
+            else:
+                tracker.removeedge(*edges.pop(rng.randrange(len(edges))))
+            true_dist = {vertex: depth for depth, level
+                         in enumerate(g.bfs_levels(vertices[0]))
+                         for vertex in level}
+            assert tracker.distances == true_dist
+
+    def test_incremental_bfs_stale(self, city_graph):
+        """Check edits made directly on graph are detected."""
+        g = city_graph
+        tracker = g.incremental_bfs(g.v('Boston'))
+        g.addedge(g.v('Boston'), g.v('Denver'))
+        with pytest.raises(ValueError):
+            tracker.distance(g.v('Denver'))
+        with pytest.raises(ValueError):
+            tracker.addedge(g.v('Denver'), g.v('Los Angeles'))
+
+    def test_k_shortest_paths(self, city_graph):
+        """Check all simple paths are generated shortest first."""
+        g = city_graph
+        paths = list(g.k_shortest_paths(g.v('Boston'), g.v('Phoenix')))
+        assert [len(path) for path in paths] == [4, 5, 5, 6]
+        assert str(paths[0]) == "['Boston', 'New York', 'Chicago', 'Phoenix']"
+        assert {str(path) for path in paths[1:3]} == {
+            "['Boston', 'New York', 'Chicago', 'Denver', 'Phoenix']",
+            "['Boston', 'Providence', 'New York', 'Chicago', 'Phoenix']"}
+
+    def test_k_shortest_paths_k(self, city_graph):
+        """Check at most k paths are generated."""
+        g = city_graph
+        paths = list(g.k_shortest_paths(g.v('Boston'), g.v('Phoenix'), k=2))
+        assert [len(path) for path in paths] == [4, 5]
+        assert list(g.k_shortest_paths(g.v('Boston'),
+                                       g.v('Los Angeles'))) == []
+
+    def test_k_shortest_paths_spur_expansions(self):
+        """Check spur searches do not visit every vertex."""
+        s, a, b, e = (Vertex(name) for name in 'sabe')
+        edges = [(s, a), (a, e), (s, b), (b, e)]
+        for i in range(300):
+            chain = [s] + [Vertex((i, j)) for j in range(3)] + [e]
+            edges.extend(zip(chain, chain[1:]))
+        g = DirGraphProcess.from_edges(edges)
+        expanded = []
+        edge_costs = g._edge_costs
+
+        def counted(vertex):
+            expanded.append(vertex)
+            return edge_costs(vertex)
+
+        g._edge_costs = counted
+        paths = list(g.k_shortest_paths(s, e, k=3))
+        assert [len(path) for path in paths] == [3, 3, 5]
+        assert len(expanded) < 20 < len(g.adj)
+
+    def test_csr_bfs_it_shortpath(self, city_graph):
+        """Check shortest path on CSR copy of graph is correct."""
+        g = CSRGraphProcess.from_dirgraph(city_graph)
+        v1, v2 = g.v('Boston'), g.v('Phoenix')
+        shortpath = g.bfs_it_shortpath(v1, v2)
+        truepath = "['Boston', 'New York', 'Chicago', 'Phoenix']"
+        assert str(shortpath) == truepath
+
+    def test_csr_traversals_random(self):
+        """Check CSR searches by id agree with adjacency list searches."""
+        rng = random.Random(3)
+        vertices = [Vertex(i) for i in range(50)]
+        edges = [(rng.choice(vertices), rng.choice(vertices))
+                 for _ in range(80)]
+        g = DirGraphProcess.from_edges(edges, vertices)
+        csr = CSRGraphProcess.from_dirgraph(g)
+        for start in vertices[:10]:
+            assert csr._bfs_parents(start) == g._bfs_parents(start)
+            ends = set(vertices[10:13])
+            assert set(csr._bfs_parents(start, ends)) == \
+                set(g._bfs_parents(start, ends))
+            assert list(csr.bfs_levels(start)) == list(g.bfs_levels(start))
+            visited = set(vertices[20:30])
+            assert list(csr.dfs_preorder(start, set(visited))) == \
+                list(g.dfs_preorder(start, set(visited)))
+        assert str(csr) == str(g)
+        assert csr.adj is csr.adj
+
+
+class TestGraphProcess:
+    """Tests for GraphProcess class."""
+
+    @pytest.fixture
+    def city_graph(scope='class'):
+        """Undirected graph of cities in three components."""
+        names = ['Boston', 'Providence', 'New York', 'Chicago',
+                 'Denver', 'Phoenix', 'Los Angeles']
+        vertices = [Vertex(name) for name in names]
+        g = GraphProcess({vertex: [] for vertex in vertices})
+        edges = [('Boston', 'Providence'), ('New York', 'Boston'),
+                 ('Chicago', 'Denver'), ('Denver', 'Phoenix')]
+        g.add_edges((g.v(city1), g.v(city2)) for city1, city2 in edges)
+        return g
+
+    def test_connected_components(self, city_graph):
+        """Check component labels are correct."""
+        g = city_graph
+        assert list(g.connected_components()) == [0, 0, 0, 1, 1, 1, 2]
+        assert g.component_count() == 3
+
+    def test_connected_components_after_edge(self, city_graph):
+        """Check components merge after an edge is added."""
+        g = city_graph
+        g.addedge(g.v('Los Angeles'), g.v('Phoenix'))
+        assert list(g.connected_components()) == [0, 0, 0, 1, 1, 1, 1]
+
+    def test_component_count_streaming(self, city_graph):
+        """Check counts are updated in place as vertices and edges arrive."""
+        g = city_graph
+        assert g.component_count() == 3
+        components = g._components
+        seattle = Vertex('Seattle')
+        g.addvertex(seattle)
+        assert g.component_count() == 4
+        g.addedge(seattle, g.v('Boston'))
+        g.add_edges([(g.v('Los Angeles'), g.v('Phoenix')),
+                     (g.v('Denver'), g.v('Boston'))])
+        assert g.component_count() == 1
+        assert g._components is components
+        g.removeedge(g.v('Denver'), g.v('Boston'))
+        assert g.component_count() == 2
+        assert list(g.connected_components()) == [0, 0, 0, 1, 1, 1, 1, 0]
+
+    def test_component_count_random(self):
+        """Check counts agree with traversal under random edits."""
+        rng = random.Random(7)
+        vertices = [Vertex(i) for i in range(40)]
+        g = GraphProcess({vertex: [] for vertex in vertices})
+        for step in range(120):
+            if step % 10 == 9 and g.children(vertices[0]):
+                g.removeedge(vertices[0], g.children(vertices[0])[0])
+            else:
+                g.addedge(rng.choice(vertices), rng.choice(vertices))
+            seen = set()
+            count = 0
+            for vertex in vertices:
+                if vertex not in seen:
+                    count += 1
+                    seen.update(g.bfs_traversal(vertex))
+            assert g.component_count() == count
+
+    def test_incremental_bfs(self, city_graph):
+        """Check distances follow undirected edits given in either order."""
+        g = city_graph
+        tracker = g.incremental_bfs(g.v('Boston'))
+        assert tracker.distance(g.v('New York')) == 1
+        tracker.addedge(g.v('Denver'), g.v('New York'))
+        assert tracker.distance(g.v('Phoenix')) == 3
+        tracker.removeedge(g.v('Denver'), g.v('New York'))
+        assert tracker.distance(g.v('Phoenix')) is None
+        tracker.addedge(g.v('Los Angeles'), g.v('Providence'))
+        tracker.addedge(g.v('Chicago'), g.v('Los Angeles'))
+        assert tracker.distance(g.v('Phoenix')) == 5
+        tracker.removeedge(g.v('Chicago'), g.v('Los Angeles'))
+        assert tracker.distance(g.v('Chicago')) is None
+
+    def test_incremental_bfs_random(self):
+        """Check distances agree with a fresh search after random edits."""
+        rng = random.Random(6)
+        vertices = [Vertex(i) for i in range(30)]
+        edges = [(rng.choice(vertices), rng.choice(vertices))
+                 for _ in range(30)]
+        g = GraphProcess.from_edges(edges, vertices)
+        tracker = g.incremental_bfs(vertices[0])
+        for _ in range(200):
+            if rng.random() < 0.5:
+                edge = (rng.choice(vertices), rng.choice(vertices))
+                tracker.addedge(*edge)
+                edges.append(edge)
+            else:
+                tracker.removeedge(*edges.pop(rng.randrange(len(edges))))
+            true_dist = {vertex: depth for depth, level
+                         in enumerate(g.bfs_levels(vertices[0]))
+                         for vertex in level}
+            assert tracker.distances == true_dist
+
+
+class TestWeightedDirGraphProcess:
+    """Tests for WeightedDirGraphProcess class."""
+
+    @pytest.fixture
+    def city_graph(scope='class'):
+        """Graph of cities on a line with distances as weights."""
+        positions = {'Boston': 0, 'Providence': 1, 'New York': 3,
+                     'Chicago': 13, 'Denver': 20, 'Phoenix': 23}
+        vertices = [Vertex(name) for name in positions]
+        g = WeightedDirGraphProcess({vertex: [] for vertex in vertices})
+        edges = [('Boston', 'Providence'), ('Boston', 'Chicago'),
+                 ('Providence', 'New York'), ('New York', 'Chicago'),
+                 ('Chicago', 'Denver'), ('Chicago', 'Phoenix'),
+                 ('Denver', 'Phoenix'), ('New York', 'Phoenix')]
+        g.add_edges((g.v(city1), g.v(city2),
+                     abs(positions[city2] - positions[city1]) + 1)
+                    for city1, city2 in edges)
+        return positions, g
+
+    def test_dijkstra_shortpath(self, city_graph):
+        """Check least cost path and cost are correct."""
+        _, g = city_graph
+        shortpath, cost = g.dijkstra_shortpath(g.v('Boston'), g.v('Denver'))
+        assert str(shortpath) == "['Boston', 'Chicago', 'Denver']"
+        assert cost == 22
+
+    def test_dijkstra_no_path(self, city_graph):
+        """Check None and infinite cost are returned if no path."""
+        _, g = city_graph
+        shortpath, cost = g.dijkstra_shortpath(g.v('Phoenix'), g.v('Boston'))
+        assert shortpath is None
+        assert cost == float('inf')
+
+    def test_astar_shortpath(self, city_graph):
+        """Check A* with distance heuristic agrees with Dijkstra."""
+        positions, g = city_graph
+
+        def heuristic(vertex, end):
+            return abs(positions[end.data] - positions[vertex.data])
+
+        for vertex in g.vertices:
+            for end in g.vertices:
+                assert (g.astar_shortpath(vertex, end, heuristic)[1] ==
+                        g.dijkstra_shortpath(vertex, end)[1])
+
+    def test_dijkstra_distances(self, city_graph):
+        """Check least costs to all vertices are correct."""
+        _, g = city_graph
+        dist = g.dijkstra_distances(g.v('New York'))
+        assert {str(v): d for v, d in dist.items()} == \
+            {'New York': 0, 'Chicago': 11, 'Denver': 19, 'Phoenix': 21}
+
+    def test_negative_weight(self, city_graph):
+        """Check negative edge weights raise an error."""
+        _, g = city_graph
+        g.addedge(g.v('Boston'), g.v('Providence'), -1.0)
+        with pytest.raises(ValueError):
+            g.dijkstra_shortpath(g.v('Boston'), g.v('Phoenix'))
+
+    def test_k_shortest_paths(self):
+        """Check paths agree with brute force enumeration."""
+        rng = random.Random(5)
+        vertices = [Vertex(i) for i in range(8)]
+        edges = [(rng.choice(vertices), rng.choice(vertices),
+                  float(rng.randint(1, 5))) for _ in range(30)]
+        g = WeightedDirGraphProcess.from_edges(edges, vertices)
+
+        def simple_paths(path, cost):
+            if path[-1] == vertices[-1]:
+                yield tuple(path), cost
+                return
+            for child, weight in g.weighted_children(path[-1]):
+                if child not in path:
+                    yield from simple_paths(path + [child], cost + weight)
+
+        # parallel edges give several costs for a path, keep the least
+        true_costs = {}
+        for path, cost in simple_paths([vertices[0]], 0.0):
+            true_costs[path] = min(cost, true_costs.get(path, cost))
+        paths = list(g.k_shortest_paths(vertices[0], vertices[-1]))
+        assert len(paths) == len(true_costs)
+        for path, cost in paths:
+            assert true_costs[tuple(path)] == cost
+        costs = [cost for _, cost in paths]
+        assert costs == sorted(costs)
+        assert costs[0] == g.dijkstra_shortpath(vertices[0], vertices[-1])[1]
+
+    def test_undirected(self):
+        """Check least cost path in undirected graph uses both directions."""
+        vertices = [Vertex(name) for name in ['Boston', 'Providence',
+                                              'New York']]
+        b, p, n = vertices
+        g = WeightedGraphProcess.from_edges([(b, p, 1.0), (n, p, 1.0),
+                                             (b, n, 5.0)])
+        shortpath, cost = g.dijkstra_shortpath(n, b)
+        assert shortpath.vertices == [n, p, b]
+        assert cost == 2.0
+
+
+class TestWeightedGraphProcess:
+    """Tests for WeightedGraphProcess class."""
+
+    @pytest.fixture
+    def city_graph(scope='class'):
+        """Undirected weighted graph of cities with a separate component."""
+        names = ['Boston', 'Providence', 'New York', 'Chicago',
+                 'Denver', 'Phoenix', 'Los Angeles', 'San Francisco']
+        vertices = [Vertex(name) for name in names]
+        g = WeightedGraphProcess({vertex: [] for vertex in vertices})
+        edges = [('Boston', 'Providence', 1), ('Boston', 'New York', 4),
+                 ('Providence', 'New York', 3), ('New York', 'Chicago', 8),
+                 ('Boston', 'Chicago', 10), ('Chicago', 'Denver', 9),
+                 ('Chicago', 'Phoenix', 15), ('Denver', 'Phoenix', 6),
+                 ('Los Angeles', 'San Francisco', 4)]
+        g.add_edges((g.v(city1), g.v(city2), weight)
+                    for city1, city2, weight in edges)
+        return g
+
+    def test_kruskal_mst(self, city_graph):
+        """Check spanning forest has the right edges and cost."""
+        g = city_graph
+        tree, cost = g.kruskal_mst()
+        assert cost == 31
+        assert len(tree) == 6
+        assert {frozenset((str(u), str(v))) for u, v, _ in tree} == {
+            frozenset(edge) for edge in [
+                ('Boston', 'Providence'), ('Providence', 'New York'),
+                ('New York', 'Chicago'), ('Chicago', 'Denver'),
+                ('Denver', 'Phoenix'), ('Los Angeles', 'San Francisco')]}
+
+    def test_prim_mst(self, city_graph):
+        """Check lazy and eager Prim agree with Kruskal."""
+        g = city_graph
+        for lazy in (True, False):
+            tree, cost = g.prim_mst(lazy=lazy)
+            assert cost == 31
+            assert len(tree) == 6
+
+    def test_mst_random(self):
+        """Check all algorithms give the same cost on random graph."""
+        rng = random.Random(6)
+        vertices = [Vertex(i) for i in range(40)]
+        edges = [(rng.choice(vertices), rng.choice(vertices),
+                  rng.random()) for _ in range(120)]
+        g = WeightedGraphProcess.from_edges(edges, vertices)
+        kruskal_tree, kruskal_cost = g.kruskal_mst()
+        assert len(kruskal_tree) == len(vertices) - g.component_count()
+        for lazy in (True, False):
+            prim_tree, prim_cost = g.prim_mst(lazy=lazy)
+            assert len(prim_tree) == len(kruskal_tree)
+            assert prim_cost == pytest.approx(kruskal_cost)
@@ -1,7 +1,11 @@
 """Unit tests for tree structures."""
 
+import math
+import random
+import sys
+
 import pytest
-from structures.tree import BinarySearchTree
+from structures.tree import BinarySearchTree, ArrayBinarySearchTree
 
 
 class TestBinarySearchTree:
@@ -108,3 +112,333 @@ class TestBinarySearchTree:
         bst = large_tree
         with pytest.raises(ValueError):
             bst.search(bst.root, 100)
+
+    def test_delete_leaf(self, large_tree, large_tree_list):
+        """Deleting a leaf removes it."""
+        bst = large_tree
+        bst.delete(bst.root, 5)
+        assert bst.root.left.left.right is None
+        large_tree_list.remove(5)
+        assert bst.inorder_traversal(bst.root) == sorted(large_tree_list)
+
+    def test_delete_one_child(self, large_tree, large_tree_list):
+        """Deleting a node with one child moves the child up."""
+        bst = large_tree
+        bst.delete(bst.root, 8)
+        assert bst.root.left.right.data == 10
+        bst.delete(bst.root, 4)
+        assert bst.root.left.left.data == 5
+        assert bst.inorder_traversal(bst.root) == [5, 6, 10, 11, 17, 19,
+                                                   31, 43, 49]
+
+    def test_delete_negative(self, large_tree):
+        """Deleting missing value raises error."""
+        bst = large_tree
+        with pytest.raises(ValueError):
+            bst.delete(bst.root, 100)
+
+    def test_heights(self, large_tree):
+        """Subtree heights are kept without balancing."""
+        bst = large_tree
+        assert _check_height(bst.root) == 4
+        bst.insert(bst.root, [50, 51, 52])
+        assert _check_height(bst.root) == 7
+        bst.delete(bst.root, 52)
+        assert _check_height(bst.root) == 6
+
+    def test_unknown_balance(self):
+        """Unknown balancing scheme raises error."""
+        with pytest.raises(ValueError):
+            BinarySearchTree([1, 2], balance='splay')
+
+    def test_inorder_iterator(self, large_tree, large_tree_list):
+        """Method inorder yields values lazily in order."""
+        bst = large_tree
+        values = bst.inorder()
+        assert next(values) == 4
+        assert list(values) == sorted(large_tree_list)[1:]
+        assert list(bst.inorder(bst.root.left)) == [4, 5, 6, 8, 10]
+        assert list(bst) == sorted(large_tree_list)
+
+    def test_empty_tree(self):
+        """Empty tree has no values and takes first inserted value."""
+        bst = BinarySearchTree([])
+        assert list(bst) == []
+        bst.insert(bst.root, [0, -1])
+        assert list(bst) == [-1, 0]
+
+    def test_deep_tree(self):
+        """Operations on degenerate tree do not hit recursion limit."""
+        n = sys.getrecursionlimit() + 100
+        bst = BinarySearchTree(range(n))
+        assert bst.search(bst.root, n - 1).data == n - 1
+        assert bst.inorder_traversal(bst.root) == list(range(n))
+        bst.delete(bst.root, n - 1)
+        assert bst.max_val(bst.root) == n - 2
+
+
+def _check_height(node):
+    """Check subtree heights below node and return its height."""
+    if node is None:
+        return 0
+    height = 1 + max(_check_height(node.left), _check_height(node.right))
+    assert node.height == height
+    return height
+
+
+def _check_avl(node):
+    """Check AVL invariants below node and return its height."""
+    if node is None:
+        return 0
+    left, right = _check_avl(node.left), _check_avl(node.right)
+    assert abs(left - right) <= 1
+    assert node.height == 1 + max(left, right)
+    return node.height
+
+
+class TestAVLTree:
+    """Tests for BinarySearchTree class with AVL balancing."""
+
+    @pytest.fixture
+    def sorted_tree(scope='class'):
+        """AVL tree constructed from sorted input."""
+        return BinarySearchTree(range(1000), balance='avl')
+
+    def test_sorted_tree_height(self, sorted_tree):
+        """Sorted input gives a balanced tree of logarithmic height."""
+        bst = sorted_tree
+        assert _check_avl(bst.root) <= 1.44 * math.log2(1000 + 2)
+        assert bst.inorder_traversal(bst.root) == list(range(1000))
+
+    def test_rotations(self):
+        """Each kind of rotation gives a balanced root."""
+        for data in ([1, 2, 3], [3, 2, 1], [1, 3, 2], [3, 1, 2]):
+            bst = BinarySearchTree(data, balance='avl')
+            assert bst.root.data == 2
+            assert bst.root.left.data == 1
+            assert bst.root.right.data == 3
+
+    def test_search_min_max(self, sorted_tree):
+        """Methods search, min_val and max_val work on balanced tree."""
+        bst = sorted_tree
+        assert bst.search(bst.root, 617).data == 617
+        assert bst.min_val(bst.root) == 0
+        assert bst.max_val(bst.root) == 999
+        with pytest.raises(ValueError):
+            bst.search(bst.root, 1000)
+
+    def test_insert_delete_random(self):
+        """Tree stays balanced and sorted under random inserts and deletes."""
+        rng = random.Random(0)
+        data = [rng.randrange(200) for _ in range(300)]
+        bst = BinarySearchTree(balance='avl')
+        bst.insert(bst.root, data)
+        _check_avl(bst.root)
+        for elt in data[:250]:
+            bst.delete(bst.root, elt)
+            _check_avl(bst.root)
+        assert bst.inorder_traversal(bst.root) == sorted(data[250:])
+
+    def test_delete_all(self):
+        """Deleting every value leaves an empty tree."""
+        bst = BinarySearchTree([2, 1, 3], balance='avl')
+        for elt in (2, 1, 3):
+            bst.delete(bst.root, elt)
+        assert bst.root.data is None
+        bst.insert(bst.root, 5)
+        assert bst.root.data == 5
+
+
+class TestFromSorted:
+    """Tests for BinarySearchTree.from_sorted constructor."""
+
+    def test_perfectly_balanced(self):
+        """Sorted values give tree of minimum height."""
+        bst = BinarySearchTree.from_sorted(range(1023))
+        assert _check_avl(bst.root) == 10
+        assert bst.root.data == 511
+        assert list(bst) == list(range(1023))
+
+    def test_sort(self):
+        """Unsorted values are sorted first."""
+        data = [11, 6, 8, 19, 4, 10, 5, 17, 43, 49, 31]
+        bst = BinarySearchTree.from_sorted(data, sort=True)
+        assert bst.root.data == 11
+        assert bst.root.left.data == 6
+        assert list(bst) == sorted(data)
+
+    def test_empty(self):
+        """No values give empty tree."""
+        bst = BinarySearchTree.from_sorted([])
+        assert list(bst) == []
+        assert bst.root.data is None
+
+    def test_balanced_updates(self):
+        """Bulk loaded AVL tree stays balanced under updates."""
+        bst = BinarySearchTree.from_sorted(range(0, 200, 2), balance='avl')
+        bst.insert(bst.root, range(1, 200, 2))
+        for elt in range(0, 100):
+            bst.delete(bst.root, elt)
+        _check_avl(bst.root)
+        assert list(bst) == list(range(100, 200))
+
+
+def _check_size(node):
+    """Check subtree sizes below node and return its size."""
+    if node is None:
+        return 0
+    size = 1 + _check_size(node.left) + _check_size(node.right)
+    assert node.size == size
+    return size
+
+
+class TestOrderStatistics:
+    """Tests for select, rank and range_values methods."""
+
+    @pytest.fixture(params=[None, 'avl'])
+    def random_tree(self, request):
+        """Tree after random inserts and deletes, with sorted values."""
+        rng = random.Random(1)
+        data = [rng.randrange(100) for _ in range(400)]
+        bst = BinarySearchTree(balance=request.param)
+        bst.insert(bst.root, data)
+        for elt in data[:200]:
+            bst.delete(bst.root, elt)
+        return bst, sorted(data[200:])
+
+    def test_size(self, random_tree):
+        """Subtree sizes are maintained by insert and delete."""
+        bst, values = random_tree
+        assert _check_size(bst.root) == len(bst) == len(values)
+        _check_height(bst.root)
+
+    def test_select(self, random_tree):
+        """Method select returns k-th smallest value."""
+        bst, values = random_tree
+        assert [bst.select(k) for k in range(len(values))] == values
+        with pytest.raises(ValueError):
+            bst.select(len(values))
+
+    def test_rank(self, random_tree):
+        """Method rank counts smaller values."""
+        bst, values = random_tree
+        for elt in range(-1, 102):
+            assert bst.rank(elt) == sum(1 for v in values if v < elt)
+
+    def test_range_values(self, random_tree):
+        """Method range_values yields values in half-open range."""
+        bst, values = random_tree
+        for lo, hi in [(-5, 200), (10, 20), (37, 38), (50, 50), (60, 40)]:
+            assert (list(bst.range_values(lo, hi))
+                    == [v for v in values if lo <= v < hi])
+
+    def test_from_sorted_sizes(self):
+        """Bulk loaded tree has subtree sizes."""
+        bst = BinarySearchTree.from_sorted(range(100))
+        assert _check_size(bst.root) == len(bst) == 100
+        assert bst.select(42) == 42
+        assert bst.rank(42) == 42
+
+    def test_empty(self):
+        """Empty tree has no order statistics."""
+        bst = BinarySearchTree()
+        assert len(bst) == 0
+        assert bst.rank(5) == 0
+        assert list(bst.range_values(0, 10)) == []
+        with pytest.raises(ValueError):
+            bst.select(0)
+
+
+def _shape(node):
+    """Nested tuples of values giving shape of tree below node."""
+    if node is None:
+        return None
+    return (node.data, _shape(node.left), _shape(node.right))
+
+
+class TestArrayBinarySearchTree:
+    """Tests for ArrayBinarySearchTree class."""
+
+    @pytest.fixture
+    def large_tree_list(scope='class'):
+        """List of node for large tree."""
+        return [11, 6, 8, 19, 4, 10, 5, 17, 43, 49, 31]
+
+    def test_same_shape(self, large_tree_list):
+        """Tree has same shape as node based tree after updates."""
+        bst = BinarySearchTree(large_tree_list)
+        abst = ArrayBinarySearchTree(large_tree_list)
+        assert _shape(abst.root) == _shape(bst.root)
+        for elt in (11, 5, 8):
+            bst.delete(bst.root, elt)
+            abst.delete(abst.root, elt)
+        assert _shape(abst.root) == _shape(bst.root)
+        assert abst.root.data == 10
+
+    def test_search_min_max(self, large_tree_list):
+        """Methods search, min_val and max_val return correct values."""
+        bst = ArrayBinarySearchTree(large_tree_list)
+        assert bst.search(bst.root, 17).data == 17
+        assert bst.min_val(bst.root) == 4
+        assert bst.max_val(bst.root) == 49
+        assert bst.inorder_traversal(bst.root.left) == [4, 5, 6, 8, 10]
+        with pytest.raises(ValueError):
+            bst.search(bst.root, 100)
+        with pytest.raises(ValueError):
+            bst.delete(bst.root, 100)
+
+    @pytest.mark.parametrize('balance', [None, 'avl'])
+    def test_random_updates(self, balance):
+        """Values, sizes and balance are kept under random updates."""
+        rng = random.Random(2)
+        data = [rng.randrange(100) for _ in range(400)]
+        bst = ArrayBinarySearchTree(data, balance=balance)
+        for elt in data[:200]:
+            bst.delete(bst.root, elt)
+        values = sorted(data[200:])
+        assert list(bst) == values
+        assert _check_size(bst.root) == len(bst) == 200
+        _check_height(bst.root)
+        if balance:
+            _check_avl(bst.root)
+        assert [bst.select(k) for k in range(200)] == values
+        assert bst.rank(50) == sum(1 for v in values if v < 50)
+        assert (list(bst.range_values(20, 40))
+                == [v for v in values if 20 <= v < 40])
+
+    def test_free_list(self):
+        """Slots of deleted nodes are reused."""
+        bst = ArrayBinarySearchTree(range(10), balance='avl')
+        slots = len(bst._keys)
+        for elt in range(5):
+            bst.delete(bst.root, elt)
+        bst.insert(bst.root, range(10, 15))
+        assert len(bst._keys) == slots
+        assert list(bst) == list(range(5, 15))
+
+    def test_float_keys(self):
+        """Float type code stores floats."""
+        bst = ArrayBinarySearchTree([2.5, 1.5, 3.5], typecode='d')
+        assert bst.typecode == 'd'
+        assert list(bst) == [1.5, 2.5, 3.5]
+
+    def test_from_sorted(self):
+        """Bulk load gives perfectly balanced tree."""
+        bst = ArrayBinarySearchTree.from_sorted([3, 1, 2, 0, 4, 6, 5],
+                                                sort=True)
+        assert _check_avl(bst.root) == 3
+        assert _check_size(bst.root) == 7
+        assert bst.root.data == 3
+        assert list(bst) == list(range(7))
+
+    def test_empty(self):
+        """Empty tree has no values."""
+        bst = ArrayBinarySearchTree()
+        assert bst.root.data is None
+        assert len(bst) == 0
+        assert list(bst) == []
+        with pytest.raises(ValueError):
+            bst.search(bst.root, 1)
+        bst.insert(bst.root, 1)
+        bst.delete(bst.root, 1)
+        assert len(bst) == 0
@@ -0,0 +1,52 @@
+"""Unit tests for disjoint set structures."""
+
+import pytest
+from structures.unionfind import UnionFind
+
+
+class TestUnionFind:
+    """Tests for UnionFind class."""
+
+    @pytest.fixture
+    def two_sets(scope='class'):
+        """Ten elements in two sets of evens and odds."""
+        uf = UnionFind(10)
+        uf.union_edges((i, i + 2) for i in range(8))
+        return uf
+
+    def test_count(self, two_sets):
+        """Number of sets is correct."""
+        assert two_sets.count == 2
+        assert len(two_sets) == 10
+
+    def test_connected(self, two_sets):
+        """Elements are in the correct sets."""
+        assert two_sets.connected(0, 8)
+        assert two_sets.connected(1, 9)
+        assert not two_sets.connected(0, 9)
+
+    def test_union(self, two_sets):
+        """Union merges sets once."""
+        assert two_sets.union(3, 4)
+        assert not two_sets.union(0, 9)
+        assert two_sets.count == 1
+
+    def test_add(self, two_sets):
+        """Added element starts in its own set."""
+        i = two_sets.add()
+        assert i == 10
+        assert two_sets.count == 3
+        two_sets.union(i, 5)
+        assert two_sets.count == 2
+        assert two_sets.connected(10, 1)
+
+    def test_labels(self, two_sets):
+        """Labels are numbered in order of first element."""
+        assert list(two_sets.labels()) == [0, 1] * 5
+
+    def test_long_chain(self):
+        """Find on long chain of unions is correct and compresses path."""
+        uf = UnionFind(100000)
+        uf.union_edges((i, i + 1) for i in range(99999))
+        assert uf.count == 1
+        assert uf.find(0) == uf.find(99999)